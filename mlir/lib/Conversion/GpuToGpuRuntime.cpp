@@ -1676,6 +1676,83 @@ static llvm::Optional<mlir::Attribute> getNeutralValue(mlir::Block &block) {
   return mlir::linalg::getNeutralElement(&(*body.begin()));
 }
 
+// Collapse leading dimensions of loops with more than 3 dimensions into one,
+// so all of them can be mapped to the GPU grid. Innermost dimensions are kept
+// intact for memory coalescing.
+struct CollapseParallelOp
+    : public mlir::OpRewritePattern<mlir::scf::ParallelOp> {
+  // Must run before TileParallelOp.
+  CollapseParallelOp(mlir::MLIRContext *context)
+      : mlir::OpRewritePattern<mlir::scf::ParallelOp>(context,
+                                                      /*benefit*/ 10) {}
+
+  mlir::LogicalResult
+  matchAndRewrite(mlir::scf::ParallelOp op,
+                  mlir::PatternRewriter &rewriter) const override {
+    // Process only loops inside gpu region.
+    auto envOp = op->getParentOfType<numba::util::EnvironmentRegionOp>();
+    if (!envOp || !envOp.getEnvironment().isa<gpu_runtime::GPURegionDescAttr>())
+      return mlir::failure();
+
+    // Process only outermost loops without mappings.
+    if (op->getParentOfType<mlir::scf::ParallelOp>() ||
+        op->hasAttr(mlir::gpu::getMappingAttrName()))
+      return mlir::failure();
+
+    const unsigned maxLoops = 3;
+    auto lowerBounds = op.getLowerBound();
+    auto upperBounds = op.getUpperBound();
+    auto steps = op.getStep();
+    auto loopsCount = static_cast<unsigned>(steps.size());
+    if (loopsCount <= maxLoops)
+      return mlir::failure();
+
+    // Only unit step is supported and iteration must start from 0.
+    for (auto [start, step] : llvm::zip(lowerBounds, steps))
+      if (!mlir::isConstantIntValue(start, 0) ||
+          !mlir::isConstantIntValue(step, 1))
+        return mlir::failure();
+
+    auto numCollapsed = loopsCount - maxLoops + 1;
+    auto loc = op->getLoc();
+    mlir::Value collapsedSize = upperBounds.front();
+    for (auto i : llvm::seq(1u, numCollapsed))
+      collapsedSize = rewriter.create<mlir::arith::MulIOp>(loc, collapsedSize,
+                                                           upperBounds[i]);
+
+    llvm::SmallVector<mlir::Value> newUpperBounds;
+    newUpperBounds.emplace_back(collapsedSize);
+    for (auto i : llvm::seq(numCollapsed, loopsCount))
+      newUpperBounds.emplace_back(upperBounds[i]);
+
+    auto newOp = rewriter.create<mlir::scf::ParallelOp>(
+        loc, lowerBounds.take_front(maxLoops), newUpperBounds,
+        steps.take_front(maxLoops), op.getInitVals());
+    mlir::Block *newBlock = newOp.getBody();
+    if (!newBlock->empty())
+      rewriter.eraseOp(newBlock->getTerminator());
+
+    llvm::SmallVector<mlir::Value> argMapping(loopsCount);
+    {
+      mlir::OpBuilder::InsertionGuard g(rewriter);
+      rewriter.setInsertionPointToStart(newBlock);
+      mlir::Value idx = newBlock->getArgument(0);
+      for (auto i : llvm::reverse(llvm::seq(1u, numCollapsed))) {
+        argMapping[i] =
+            rewriter.create<mlir::arith::RemUIOp>(loc, idx, upperBounds[i]);
+        idx = rewriter.create<mlir::arith::DivUIOp>(loc, idx, upperBounds[i]);
+      }
+      argMapping[0] = idx;
+      for (auto i : llvm::seq(numCollapsed, loopsCount))
+        argMapping[i] = newBlock->getArgument(i - numCollapsed + 1);
+    }
+
+    rewriter.mergeBlocks(op.getBody(), newBlock, argMapping);
+    rewriter.replaceOp(op, newOp->getResults());
+    return mlir::success();
+  }
+};
+
 struct TileParallelOp : public mlir::OpRewritePattern<mlir::scf::ParallelOp> {
   using OpRewritePattern::OpRewritePattern;
 
@@ -1728,9 +1805,14 @@ struct TileParallelOp : public mlir::OpRewritePattern<mlir::scf::ParallelOp> {
     mlir::Value zero = rewriter.create<mlir::arith::ConstantIndexOp>(loc, 0);
     mlir::Value one = rewriter.create<mlir::arith::ConstantIndexOp>(loc, 1);
 
+    // Map innermost loop to the x dimension, so adjacent threads access
+    // adjacent elements of row-major arrays and memory accesses coalesce.
+    auto getDim = [&](unsigned loop) { return numLoops - loop - 1; };
+
     std::array<mlir::Value, 3> globalSize;
     globalSize.fill(one);
-    llvm::copy(oldUpperBounds.take_front(numLoops), globalSize.begin());
+    for (auto i : llvm::seq(0u, numLoops))
+      globalSize[getDim(i)] = oldUpperBounds[i];
 
     llvm::Optional<mlir::Value> stream;
     auto localSize =
@@ -1747,9 +1829,8 @@ struct TileParallelOp : public mlir::OpRewritePattern<mlir::scf::ParallelOp> {
       newLowerBounds.emplace_back(zero);
       newSteps.emplace_back(one);
       if (i < numLoops) {
-        auto oldUpperBound = oldUpperBounds[i];
         mlir::Value newUpperBound = rewriter.create<mlir::arith::CeilDivUIOp>(
-            loc, oldUpperBound, localSize[i]);
+            loc, globalSize[i], localSize[i]);
         newUpperBounds.emplace_back(newUpperBound);
       } else {
         newUpperBounds.emplace_back(one);
@@ -1786,10 +1867,11 @@ struct TileParallelOp : public mlir::OpRewritePattern<mlir::scf::ParallelOp> {
       rewriter.setInsertionPointToStart(newBlock);
       for (auto i : llvm::seq(0u, oldLoopsCount)) {
         if (i < numLoops) {
-          mlir::Value gridId = newBlock->getArgument(i);
-          mlir::Value blockId = newBlock->getArgument(i + maxLoops);
-          mlir::Value blockSize = localSize[i];
-          mlir::Value gridSize = globalSize[i];
+          auto dim = getDim(i);
+          mlir::Value gridId = newBlock->getArgument(dim);
+          mlir::Value blockId = newBlock->getArgument(dim + maxLoops);
+          mlir::Value blockSize = localSize[dim];
+          mlir::Value gridSize = globalSize[dim];
           mlir::Value val =
               rewriter.create<mlir::arith::MulIOp>(loc, gridId, blockSize);
           val = rewriter.create<mlir::arith::AddIOp>(loc, val, blockId);
@@ -1886,7 +1968,7 @@ struct TileParallelLoopsForGPUPass
     auto *ctx = &getContext();
     mlir::RewritePatternSet patterns(ctx);
 
-    patterns.insert<TileParallelOp>(ctx);
+    patterns.insert<CollapseParallelOp, TileParallelOp>(ctx);
 
     (void)mlir::applyPatternsAndFoldGreedily(getOperation(),
                                              std::move(patterns));
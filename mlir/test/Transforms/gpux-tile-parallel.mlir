@@ -47,24 +47,24 @@ func.func @check1D(%arg0: memref<?xf64>, %arg1: memref<?xf64>) {
 // CHECK: %[[DIM2:.*]] = memref.dim %[[MEM1]], %[[C1]] : memref<?x?x?xf64>
 // CHECK: %[[DIM3:.*]] = memref.dim %[[MEM1]], %[[C2]] : memref<?x?x?xf64>
 // CHECK: numba_util.env_region #gpu_runtime.region_desc<device = "test">
-// CHECK: %[[B:.*]]:3 = gpu_runtime.suggest_block_size, %[[DIM1]], %[[DIM2]], %[[DIM3]] -> index, index, index
-// CHECK: %[[G1:.*]] = arith.ceildivui %[[DIM1]], %[[B]]#0 : index
+// CHECK: %[[B:.*]]:3 = gpu_runtime.suggest_block_size, %[[DIM3]], %[[DIM2]], %[[DIM1]] -> index, index, index
+// CHECK: %[[G1:.*]] = arith.ceildivui %[[DIM3]], %[[B]]#0 : index
 // CHECK: %[[G2:.*]] = arith.ceildivui %[[DIM2]], %[[B]]#1 : index
-// CHECK: %[[G3:.*]] = arith.ceildivui %[[DIM3]], %[[B]]#2 : index
+// CHECK: %[[G3:.*]] = arith.ceildivui %[[DIM1]], %[[B]]#2 : index
 // CHECK: scf.parallel
 // CHECK-SAME: (%[[ARG1:.*]], %[[ARG2:.*]], %[[ARG3:.*]], %[[ARG4:.*]], %[[ARG5:.*]], %[[ARG6:.*]]) =
 // CHECK-SAME: (%[[C0]], %[[C0]], %[[C0]], %[[C0]], %[[C0]], %[[C0]]) to
 // CHECK-SAME: (%[[G1]], %[[G2]], %[[G3]], %[[B]]#0, %[[B]]#1, %[[B]]#2) step
 // CHECK-SAME: (%[[C1]], %[[C1]], %[[C1]], %[[C1]], %[[C1]], %[[C1]])
-// CHECK: %[[IDX1:.*]] = arith.muli %[[ARG1]], %[[B]]#0 : index
-// CHECK: %[[IDX2:.*]] = arith.addi %[[IDX1]], %[[ARG4]] : index
+// CHECK: %[[IDX1:.*]] = arith.muli %[[ARG3]], %[[B]]#2 : index
+// CHECK: %[[IDX2:.*]] = arith.addi %[[IDX1]], %[[ARG6]] : index
 // CHECK: %[[IN1:.*]] = arith.cmpi slt, %[[IDX2]], %[[DIM1]] : index
 // CHECK: %[[IDX3:.*]] = arith.muli %[[ARG2]], %[[B]]#1 : index
 // CHECK: %[[IDX4:.*]] = arith.addi %[[IDX3]], %[[ARG5]] : index
 // CHECK: %[[IN2:.*]] = arith.cmpi slt, %[[IDX4]], %[[DIM2]] : index
 // CHECK: %[[IN3:.*]] = arith.andi %[[IN1]], %[[IN2]] : i1
-// CHECK: %[[IDX5:.*]] = arith.muli %[[ARG3]], %[[B]]#2 : index
-// CHECK: %[[IDX6:.*]] = arith.addi %[[IDX5]], %[[ARG6]] : index
+// CHECK: %[[IDX5:.*]] = arith.muli %[[ARG1]], %[[B]]#0 : index
+// CHECK: %[[IDX6:.*]] = arith.addi %[[IDX5]], %[[ARG4]] : index
 // CHECK: %[[IN4:.*]] = arith.cmpi slt, %[[IDX6]], %[[DIM3]] : index
 // CHECK: %[[IN5:.*]] = arith.andi %[[IN3]], %[[IN4]] : i1
 // CHECK: scf.if %[[IN5]] {
@@ -103,31 +103,34 @@ func.func @check3D(%arg0: memref<?x?x?xf64>, %arg1: memref<?x?x?xf64>) {
 // CHECK: %[[DIM3:.*]] = memref.dim %[[MEM1]], %[[C2]] : memref<?x?x?x?xf64>
 // CHECK: %[[DIM4:.*]] = memref.dim %[[MEM1]], %[[C3]] : memref<?x?x?x?xf64>
 // CHECK: numba_util.env_region #gpu_runtime.region_desc<device = "test">
-// CHECK: %[[B:.*]]:3 = gpu_runtime.suggest_block_size, %[[DIM1]], %[[DIM2]], %[[DIM3]] -> index, index, index
-// CHECK: %[[G1:.*]] = arith.ceildivui %[[DIM1]], %[[B]]#0 : index
-// CHECK: %[[G2:.*]] = arith.ceildivui %[[DIM2]], %[[B]]#1 : index
-// CHECK: %[[G3:.*]] = arith.ceildivui %[[DIM3]], %[[B]]#2 : index
+// CHECK: %[[DIM12:.*]] = arith.muli %[[DIM1]], %[[DIM2]] : index
+// CHECK: %[[B:.*]]:3 = gpu_runtime.suggest_block_size, %[[DIM4]], %[[DIM3]], %[[DIM12]] -> index, index, index
+// CHECK: %[[G1:.*]] = arith.ceildivui %[[DIM4]], %[[B]]#0 : index
+// CHECK: %[[G2:.*]] = arith.ceildivui %[[DIM3]], %[[B]]#1 : index
+// CHECK: %[[G3:.*]] = arith.ceildivui %[[DIM12]], %[[B]]#2 : index
 // CHECK: scf.parallel
-// CHECK-SAME: (%[[ARG1:.*]], %[[ARG2:.*]], %[[ARG3:.*]], %[[ARG4:.*]], %[[ARG5:.*]], %[[ARG6:.*]], %[[ARG7:.*]]) =
-// CHECK-SAME: (%[[C0]], %[[C0]], %[[C0]], %[[C0]], %[[C0]], %[[C0]], %[[C0]]) to
-// CHECK-SAME: (%[[G1]], %[[G2]], %[[G3]], %[[B]]#0, %[[B]]#1, %[[B]]#2, %[[DIM4]]) step
-// CHECK-SAME: (%[[C1]], %[[C1]], %[[C1]], %[[C1]], %[[C1]], %[[C1]], %[[C1]])
-// CHECK: %[[IDX1:.*]] = arith.muli %[[ARG1]], %[[B]]#0 : index
-// CHECK: %[[IDX2:.*]] = arith.addi %[[IDX1]], %[[ARG4]] : index
-// CHECK: %[[IN1:.*]] = arith.cmpi slt, %[[IDX2]], %[[DIM1]] : index
+// CHECK-SAME: (%[[ARG1:.*]], %[[ARG2:.*]], %[[ARG3:.*]], %[[ARG4:.*]], %[[ARG5:.*]], %[[ARG6:.*]]) =
+// CHECK-SAME: (%[[C0]], %[[C0]], %[[C0]], %[[C0]], %[[C0]], %[[C0]]) to
+// CHECK-SAME: (%[[G1]], %[[G2]], %[[G3]], %[[B]]#0, %[[B]]#1, %[[B]]#2) step
+// CHECK-SAME: (%[[C1]], %[[C1]], %[[C1]], %[[C1]], %[[C1]], %[[C1]])
+// CHECK: %[[IDX1:.*]] = arith.muli %[[ARG3]], %[[B]]#2 : index
+// CHECK: %[[IDX2:.*]] = arith.addi %[[IDX1]], %[[ARG6]] : index
+// CHECK: %[[IN1:.*]] = arith.cmpi slt, %[[IDX2]], %[[DIM12]] : index
 // CHECK: %[[IDX3:.*]] = arith.muli %[[ARG2]], %[[B]]#1 : index
 // CHECK: %[[IDX4:.*]] = arith.addi %[[IDX3]], %[[ARG5]] : index
-// CHECK: %[[IN2:.*]] = arith.cmpi slt, %[[IDX4]], %[[DIM2]] : index
+// CHECK: %[[IN2:.*]] = arith.cmpi slt, %[[IDX4]], %[[DIM3]] : index
 // CHECK: %[[IN3:.*]] = arith.andi %[[IN1]], %[[IN2]] : i1
-// CHECK: %[[IDX5:.*]] = arith.muli %[[ARG3]], %[[B]]#2 : index
-// CHECK: %[[IDX6:.*]] = arith.addi %[[IDX5]], %[[ARG6]] : index
-// CHECK: %[[IN4:.*]] = arith.cmpi slt, %[[IDX6]], %[[DIM3]] : index
+// CHECK: %[[IDX5:.*]] = arith.muli %[[ARG1]], %[[B]]#0 : index
+// CHECK: %[[IDX6:.*]] = arith.addi %[[IDX5]], %[[ARG4]] : index
+// CHECK: %[[IN4:.*]] = arith.cmpi slt, %[[IDX6]], %[[DIM4]] : index
 // CHECK: %[[IN5:.*]] = arith.andi %[[IN3]], %[[IN4]] : i1
 // CHECK: scf.if %[[IN5]] {
 // CHECK-NOT: }
-// CHECK: %[[VAL:.*]] = memref.load %[[MEM1]][%[[IDX2]], %[[IDX4]], %[[IDX6]], %[[ARG7]]] : memref<?x?x?x?xf64>
-// CHECK: memref.store %[[VAL]], %[[MEM2]][%[[IDX2]], %[[IDX4]], %[[IDX6]], %[[ARG7]]] : memref<?x?x?x?xf64>
-// CHECK: {mapping = [#gpu.loop_dim_map<processor = block_x, map = (d0) -> (d0), bound = (d0) -> (d0)>, #gpu.loop_dim_map<processor = block_y, map = (d0) -> (d0), bound = (d0) -> (d0)>, #gpu.loop_dim_map<processor = block_z, map = (d0) -> (d0), bound = (d0) -> (d0)>, #gpu.loop_dim_map<processor = thread_x, map = (d0) -> (d0), bound = (d0) -> (d0)>, #gpu.loop_dim_map<processor = thread_y, map = (d0) -> (d0), bound = (d0) -> (d0)>, #gpu.loop_dim_map<processor = thread_z, map = (d0) -> (d0), bound = (d0) -> (d0)>, #gpu.loop_dim_map<processor = sequential, map = (d0) -> (d0), bound = (d0) -> (d0)>]}
+// CHECK: %[[IDX7:.*]] = arith.remui %[[IDX2]], %[[DIM2]] : index
+// CHECK: %[[IDX8:.*]] = arith.divui %[[IDX2]], %[[DIM2]] : index
+// CHECK: %[[VAL:.*]] = memref.load %[[MEM1]][%[[IDX8]], %[[IDX7]], %[[IDX4]], %[[IDX6]]] : memref<?x?x?x?xf64>
+// CHECK: memref.store %[[VAL]], %[[MEM2]][%[[IDX8]], %[[IDX7]], %[[IDX4]], %[[IDX6]]] : memref<?x?x?x?xf64>
+// CHECK: {mapping = [#gpu.loop_dim_map<processor = block_x, map = (d0) -> (d0), bound = (d0) -> (d0)>, #gpu.loop_dim_map<processor = block_y, map = (d0) -> (d0), bound = (d0) -> (d0)>, #gpu.loop_dim_map<processor = block_z, map = (d0) -> (d0), bound = (d0) -> (d0)>, #gpu.loop_dim_map<processor = thread_x, map = (d0) -> (d0), bound = (d0) -> (d0)>, #gpu.loop_dim_map<processor = thread_y, map = (d0) -> (d0), bound = (d0) -> (d0)>, #gpu.loop_dim_map<processor = thread_z, map = (d0) -> (d0), bound = (d0) -> (d0)>]}
 // CHECK: return
 func.func @check4D(%arg0: memref<?x?x?x?xf64>, %arg1: memref<?x?x?x?xf64>) {
   %c3 = arith.constant 3 : index
@@ -4,8 +4,7 @@
 
 from collections import namedtuple
 from itertools import product
-from functools import reduce
-import copy
+import math
 import numpy as np
 
 try:
@@ -93,7 +92,7 @@ class atomic_proxy:
 
 
 def _save_local_state(state):
-    indices = copy.deepcopy(state.indices)
+    indices = list(state.indices)
     current_local_array = state.current_local_array[0]
     state.current_local_array[0] = 0
     return (indices, current_local_array)
@@ -275,17 +274,18 @@ def _execute_kernel(global_size, local_size, func, *args):
     saved_closure = _replace_closure(func.__closure__)
     state = _setup_execution_state(global_size, local_size)
     try:
-        groups = tuple((g + l - 1) // l for g, l in zip(global_size, local_size))
+        # (offset, size) pairs of each group along every dimension, computed
+        # once instead of being rebuilt from group ids on each iteration.
+        group_ranges = [
+            [(o, min(g - o, l)) for o in range(0, g, l)]
+            for g, l in zip(global_size, local_size)
+        ]
         need_barrier = max(local_size) > 1 and _have_barrier_ops(func)
-        for gid in product(*(range(g) for g in groups)):
-            offset = tuple(g * l for g, l in zip(gid, local_size))
-            size = tuple(
-                min(g - o, l) for o, g, l in zip(offset, global_size, local_size)
-            )
-            count = reduce(lambda a, b: a * b, size)
+        for group_range in product(*group_ranges):
+            count = math.prod(s for _, s in group_range)
             _reset_local_state(state, count)
 
-            indices_range = (range(o, o + s) for o, s in zip(offset, size))
+            indices_range = (range(o, o + s) for o, s in group_range)
 
             if need_barrier:
                 global _greenlet_found
@@ -4,6 +4,7 @@
 
 from .func_registry import add_func
 from .inner_compiler import compile_func
+from functools import lru_cache
 import numpy
 
 
@@ -147,6 +148,9 @@ class Builder:
     def linalg_index(self, dim):
         return self._linalg_index(self._context, dim)
 
+    def linalg_matmul(self, a, b, out):
+        return self._linalg_matmul(self._context, a, b, out)
+
     def from_elements(self, values, dtype=None):
         return self._from_elements(self._context, values, dtype)
 
@@ -187,6 +191,9 @@ class Builder:
     def array_type(self, dims, dtype):
         return self._array_type(self._context, dims, dtype)
 
+    def in_env_region(self):
+        return self._in_env_region(self._context)
+
 
 class FuncRegistry:
     def __init__(self):
@@ -285,6 +292,27 @@ def broadcast_type_arrays(builder, args):
     return broadcast_type(builder, tuple(get_array_type(builder, a) for a in args))
 
 
+def _map_dims(num_dims):
+    return ",".join(["d%s" % i for i in range(num_dims)])
+
+
+@lru_cache(maxsize=None)
+def affine_map(num_dims, results):
+    # `results` items are dim indices
+    exprs = ",".join(["d%s" % r for r in results])
+    return f"({_map_dims(num_dims)}) -> ({exprs})"
+
+
+def identity_map(num_dims):
+    return affine_map(num_dims, tuple(range(num_dims)))
+
+
+@lru_cache(maxsize=None)
+def scalar_map(num_dims):
+    # Maps all iterations onto the single element of a 1-element accumulator
+    return f"({_map_dims(num_dims)}) -> (0)"
+
+
 def eltwise(builder, args, body, res_type=None):
     if isinstance(args, tuple):
         args = builder.broadcast(
@@ -307,10 +335,8 @@ def eltwise(builder, args, body, res_type=None):
         dummy = builder.cast(0, res_type)
         return builder.inline_func(body, res_type, *(args + (dummy,)))
     else:
-        iterators = ["parallel" for _ in range(num_dims)]
-        dims = ",".join(["d%s" % i for i in range(num_dims)])
-        expr = f"({dims}) -> ({dims})"
-        maps = [expr for _ in range(len(args) + 1)]
+        iterators = ["parallel"] * num_dims
+        maps = [identity_map(num_dims)] * (len(args) + 1)
         init = builder.init_tensor(shape, res_type)
 
         return builder.linalg_generic(args, init, iterators, maps, body)
@@ -384,51 +410,42 @@ def is_complex(t, b):
     return t == b.complex64 or t == b.complex128
 
 
-def dtype_str(builder, dtype):
-    names = [
-        (builder.bool, "bool"),
-        (builder.int8, "int8"),
-        (builder.int16, "int16"),
-        (builder.int32, "int32"),
-        (builder.int64, "int64"),
-        (builder.uint8, "uint8"),
-        (builder.uint16, "uint16"),
-        (builder.uint32, "uint32"),
-        (builder.uint64, "uint64"),
-        (builder.int8_signless, "int8"),
-        (builder.int16_signless, "int16"),
-        (builder.int32_signless, "int32"),
-        (builder.int64_signless, "int64"),
-        (builder.float32, "float32"),
-        (builder.float64, "float64"),
-    ]
-    for t, name in names:
-        if t == dtype:
-            return name
+_dtype_info = {}
 
-    assert False, f"dtype_str unhandled type: {dtype}"
 
+def _get_dtype_info(builder):
+    # Type objects are recreated for each builder, key the table by the printed
+    # type instead, which is stable across builders.
+    if not _dtype_info:
+        info = [
+            (builder.bool, "bool", 1),
+            (builder.int8, "int8", 1),
+            (builder.int16, "int16", 2),
+            (builder.int32, "int32", 4),
+            (builder.int64, "int64", 8),
+            (builder.uint8, "uint8", 1),
+            (builder.uint16, "uint16", 2),
+            (builder.uint32, "uint32", 4),
+            (builder.uint64, "uint64", 8),
+            (builder.int8_signless, "int8", 1),
+            (builder.int16_signless, "int16", 2),
+            (builder.int32_signless, "int32", 4),
+            (builder.int64_signless, "int64", 8),
+            (builder.float32, "float32", 4),
+            (builder.float64, "float64", 8),
+        ]
+        _dtype_info.update((str(t), (name, size)) for t, name, size in info)
+
+    return _dtype_info
 
-def dtype_size(builder, dtype):
-    sizes = [
-        (builder.bool, 1),
-        (builder.int8, 1),
-        (builder.int16, 2),
-        (builder.int32, 4),
-        (builder.int64, 8),
-        (builder.uint8, 1),
-        (builder.uint16, 2),
-        (builder.uint32, 4),
-        (builder.uint64, 8),
-        (builder.int8_signless, 1),
-        (builder.int16_signless, 2),
-        (builder.int32_signless, 4),
-        (builder.int64_signless, 8),
-        (builder.float32, 4),
-        (builder.float64, 8),
-    ]
-    for t, size in sizes:
-        if t == dtype:
-            return size
 
-    assert False, f"dtype_size unhandled type: {dtype}"
+def dtype_str(builder, dtype):
+    info = _get_dtype_info(builder).get(str(dtype))
+    assert info is not None, f"dtype_str unhandled type: {dtype}"
+    return info[0]
+
+
+def dtype_size(builder, dtype):
+    info = _get_dtype_info(builder).get(str(dtype))
+    assert info is not None, f"dtype_size unhandled type: {dtype}"
+    return info[1]
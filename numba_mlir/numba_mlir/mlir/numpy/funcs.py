@@ -3,7 +3,9 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 
 from ..linalg_builder import (
+    affine_map,
     asarray,
+    broadcast_type,
     broadcast_type_arrays,
     convert_array,
     dtype_size,
@@ -12,10 +14,12 @@ from ..linalg_builder import (
     FuncRegistry,
     get_array_type,
     get_val_type,
+    identity_map,
     is_float,
     is_int,
     is_literal,
     literal,
+    scalar_map,
     DYNAMIC_DIM,
 )
 from ..func_registry import add_func
@@ -29,7 +33,7 @@ from numba.core.typing.templates import ConcreteTemplate, signature, infer_globa
 from inspect import signature as sig
 from collections import namedtuple
 
-from ..settings import MKL_AVAILABLE
+from ..settings import MKL_AVAILABLE, SPLIT_REDUCTIONS
 
 
 def performance_warning(message):
@@ -126,17 +130,84 @@ def _fix_axis(axis, num_dims):
     return axis
 
 
+def _is_zero_dim(dim):
+    dim = literal(dim)
+    return is_literal(dim) and dim == 0
+
+
+def _get_reduction_lanes(builder, dtype):
+    # Number of independent partial accumulators, enough to fill a 256-bit
+    # vector register.
+    return 4 if dtype_size(builder, dtype) == 8 else 8
+
+
+def _split_reductions(builder):
+    # Splitting emits several generics, which become separate kernel launches
+    # inside device regions.
+    return SPLIT_REDUCTIONS and not builder.in_env_region()
+
+
+def _can_split_reduction(builder, dtype):
+    return is_int(dtype, builder) or dtype in (builder.float32, builder.float64)
+
+
+def _split_reduction_1d(builder, args, res_type, init_value, body, fold_body):
+    # Split reduction into `lanes` independent accumulators to break the
+    # dependency chain between iterations, then fold partial results together
+    # with the tail.
+    lanes = _get_reduction_lanes(builder, res_type)
+    size = args[0].shape[0]
+    count = size // lanes
+    main_size = count * lanes
+
+    main = tuple(
+        builder.reshape(builder.subview(a, 0, main_size), (count, lanes)) for a in args
+    )
+    tail = tuple(builder.subview(a, main_size, size - main_size) for a in args)
+
+    maps = [identity_map(1)] * len(args) + [scalar_map(1)]
+    init = builder.from_elements(init_value, res_type)
+    res = builder.linalg_generic(tail, init, ["reduction"], maps, body)
+
+    # Both dims are marked as reductions, so MakeGenericReduceInnermost keeps
+    # the contiguous lane dim innermost instead of hoisting it into an outer
+    # parallel loop, and the lane loop stays vectorizable.
+    partial = builder.init_tensor([lanes], res_type, init_value)
+    iterators = ["reduction", "reduction"]
+    maps = [identity_map(2)] * len(args) + [affine_map(2, (1,))]
+    partial = builder.linalg_generic(main, partial, iterators, maps, body)
+
+    maps = [identity_map(1), scalar_map(1)]
+    res = builder.linalg_generic(partial, res, ["reduction"], maps, fold_body)
+    return builder.extract(res, 0)
+
+
 def _array_reduce(builder, arg, axis, body, get_init_value):
     axis = literal(axis)
     if axis is None:
         shape = arg.shape
         num_dims = len(shape)
-        iterators = ["reduction" for _ in range(num_dims)]
-        dims = ",".join(["d%s" % i for i in range(num_dims)])
-        expr1 = f"({dims}) -> ({dims})"
-        expr2 = f"({dims}) -> (0)"
-        maps = [expr1, expr2]
         res_type = promote_int(arg.dtype, builder)
+        if _split_reductions(builder):
+            if num_dims > 1:
+                # Reduce into per-row partials first, keeping the outer dim
+                # parallel, then reduce the partials as a 1D array.
+                iterators = ["parallel"] + ["reduction"] * (num_dims - 1)
+                maps = [identity_map(num_dims), affine_map(num_dims, (0,))]
+                init = builder.init_tensor(
+                    [shape[0]], res_type, get_init_value(builder, res_type)
+                )
+                arg = builder.linalg_generic(arg, init, iterators, maps, body)
+                num_dims = 1
+
+            if _can_split_reduction(builder, res_type):
+                init_value = get_init_value(builder, res_type)
+                return _split_reduction_1d(
+                    builder, (arg,), res_type, init_value, body, body
+                )
+
+        iterators = ["reduction"] * num_dims
+        maps = [identity_map(num_dims), scalar_map(num_dims)]
         init = builder.from_elements(get_init_value(builder, res_type), res_type)
         res = builder.linalg_generic(arg, init, iterators, maps, body)
         return builder.extract(res, 0)
@@ -147,11 +218,8 @@ def _array_reduce(builder, arg, axis, body, get_init_value):
         iterators = [
             ("reduction" if i == axis else "parallel") for i in range(num_dims)
         ]
-        dims1 = ",".join(["d%s" % i for i in range(num_dims)])
-        dims2 = ",".join(["d%s" % i for i in range(num_dims) if i != axis])
-        expr1 = f"({dims1}) -> ({dims1})"
-        expr2 = f"({dims1}) -> ({dims2})"
-        maps = [expr1, expr2]
+        res_dims = tuple(i for i in range(num_dims) if i != axis)
+        maps = [identity_map(num_dims), affine_map(num_dims, res_dims)]
         res_shape = tuple(shape[i] for i in range(len(shape)) if i != axis)
         res_type = promote_int(arg.dtype, builder)
         init = builder.init_tensor(
@@ -163,6 +231,17 @@ def _array_reduce(builder, arg, axis, body, get_init_value):
 @register_func("array.sum")
 @register_func("numpy.sum", numpy.sum)
 def sum_impl(builder, arg, axis=None):
+    shape = arg.shape
+    if any(_is_zero_dim(s) for s in shape):
+        res_type = promote_int(arg.dtype, builder)
+        axis = literal(axis)
+        if axis is None:
+            return builder.cast(0, res_type)
+        elif isinstance(axis, int):
+            axis = _fix_axis(axis, len(shape))
+            res_shape = tuple(s for i, s in enumerate(shape) if i != axis)
+            return builder.init_tensor(res_shape, res_type, 0)
+
     return _array_reduce(builder, arg, axis, lambda a, b: a + b, lambda b, t: 0)
 
 
@@ -239,6 +318,18 @@ def mean_impl(builder, arg, axis=None):
     return sum_impl(builder, arg, axis) / size_impl(builder, arg)
 
 
+def _register_eltwise_func(name, orig_func=None):
+    reg = register_func(name, orig_func, out="out")
+
+    def _decorator(func):
+        # Wrappers are generated from tables, give each one a distinct name so
+        # it can be told apart in tracebacks and profiles.
+        func.__name__ = func.__qualname__ = name.replace(".", "_") + "_impl"
+        return reg(func)
+
+    return _decorator
+
+
 def _gen_unary_ops():
     def f64_type(builder, t):
         if is_float(t, builder):
@@ -248,8 +339,7 @@ def _gen_unary_ops():
     def bool_type(builder, t):
         return builder.bool
 
-    def reg_func(name, func):
-        return register_func(name, func, out="out")
+    reg_func = _register_eltwise_func
 
     unary_ops = [
         (reg_func("numpy.sqrt", numpy.sqrt), f64_type, lambda a, b: math.sqrt(a)),
@@ -269,9 +359,15 @@ def _gen_unary_ops():
     ]
 
     def make_func(init, body):
-        def func(builder, arg):
-            init_type = None if init is None else init(builder, arg.dtype)
-            return eltwise(builder, arg, body, init_type)
+        if init is None:
+
+            def func(builder, arg):
+                return eltwise(builder, arg, body)
+
+        else:
+
+            def func(builder, arg):
+                return eltwise(builder, arg, body, init(builder, arg.dtype))
 
         return func
 
@@ -312,8 +408,7 @@ def _gen_binary_ops():
             return db
         return builder.float64
 
-    def reg_func(name, func=None):
-        return register_func(name, func, out="out")
+    reg_func = _register_eltwise_func
 
     binary_ops = [
         (
@@ -344,12 +439,6 @@ def _gen_binary_ops():
             select_float_type_f64,
             lambda a, b, c: a / b,
         ),
-        (
-            reg_func("numpy.power", numpy.power),
-            _select_float_type,
-            lambda a, b, c: a**b,
-        ),
-        (reg_func("operator.pow"), _select_float_type, lambda a, b, c: a**b),
         (
             reg_func("numpy.arctan2", numpy.arctan2),
             select_float_type_f64,
@@ -394,9 +483,15 @@ def _gen_binary_ops():
     ]
 
     def make_func(init, body):
-        def func(builder, arg1, arg2):
-            init_type = None if init is None else init(builder, arg1, arg2)
-            return eltwise(builder, (arg1, arg2), body, init_type)
+        if init is None:
+
+            def func(builder, arg1, arg2):
+                return eltwise(builder, (arg1, arg2), body)
+
+        else:
+
+            def func(builder, arg1, arg2):
+                return eltwise(builder, (arg1, arg2), body, init(builder, arg1, arg2))
 
         return func
 
@@ -408,6 +503,30 @@ _gen_binary_ops()
 del _gen_binary_ops
 
 
+_pow_bodies = {
+    1: lambda a, b, c: a,
+    2: lambda a, b, c: a * a,
+    3: lambda a, b, c: a * a * a,
+    4: lambda a, b, c: (a * a) * (a * a),
+}
+
+
+@register_func("numpy.power", numpy.power, out="out")
+@register_func("operator.pow", out="out")
+def pow_impl(builder, arg1, arg2):
+    # Expand small literal integer exponents into multiplications instead of
+    # generic pow call.
+    exp = literal(arg2)
+    body = None
+    if isinstance(exp, int) and not isinstance(exp, bool):
+        body = _pow_bodies.get(exp)
+
+    if body is None:
+        body = lambda a, b, c: a**b
+
+    return eltwise(builder, (arg1, arg2), body, _select_float_type(builder, arg1, arg2))
+
+
 def _init_impl(builder, shape, dtype, init=None):
     if dtype is None:
         dtype = builder.float64
@@ -534,15 +653,77 @@ def _mkl_gemm(builder, a, b, alpha, beta, shape1, shape2):
     )
 
 
+_SPLIT_K_MAX_OUTPUT_SIZE = 4096
+_SPLIT_K_MIN_BLOCK = 256
+_SPLIT_K_MAX_PARTS = 16
+
+
+def _get_split_k(m, n, k):
+    # Split K across workers only when the output alone doesn't provide
+    # enough parallelism. The split is chosen at compile time, so it only
+    # applies to statically shaped operands, e.g. arrays created inside the
+    # jitted function. Array arguments have dynamic shapes and are never split.
+    if not all(isinstance(d, int) for d in (m, n, k)):
+        return 1
+
+    if m * n >= _SPLIT_K_MAX_OUTPUT_SIZE:
+        return 1
+
+    split = min(k // _SPLIT_K_MIN_BLOCK, _SPLIT_K_MAX_PARTS)
+    while split > 1 and k % split != 0:
+        split -= 1
+
+    return split
+
+
+def _linalg_matmul2d_split_k(builder, a, b, m, n, k, split, dtype):
+    block = k // split
+    a = builder.reshape(a, (m, split, block))
+    b = builder.reshape(b, (split, block, n))
+
+    iterators = ["parallel", "parallel", "parallel", "reduction"]
+    maps = [
+        affine_map(4, (1, 0, 3)),
+        affine_map(4, (0, 3, 2)),
+        affine_map(4, (0, 1, 2)),
+    ]
+    partial = builder.init_tensor((split, m, n), dtype, 0)
+    partial = builder.linalg_generic(
+        (a, b), partial, iterators, maps, lambda a, b, c: a * b + c
+    )
+
+    iterators = ["reduction", "parallel", "parallel"]
+    maps = [identity_map(3), affine_map(3, (1, 2))]
+    init = builder.init_tensor((m, n), dtype, 0)
+    return builder.linalg_generic(partial, init, iterators, maps, lambda a, b: a + b)
+
+
+def _can_use_named_matmul(builder, a, b, dtype):
+    # linalg.matmul sign-extends (or sitofp's) its inputs to the result type
+    # and accumulates with addi, so it only matches numpy for same-typed
+    # float and signed int inputs.
+    if a.dtype != dtype or b.dtype != dtype:
+        return False
+
+    signed_types = (builder.int8, builder.int16, builder.int32, builder.int64)
+    return is_float(dtype, builder) or dtype in signed_types
+
+
 def _linalg_matmul2d(builder, a, b, shape1, shape2):
-    iterators = ["parallel", "parallel", "reduction"]
-    expr1 = "(d0,d1,d2) -> (d0,d2)"
-    expr2 = "(d0,d1,d2) -> (d2,d1)"
-    expr3 = "(d0,d1,d2) -> (d0,d1)"
-    maps = [expr1, expr2, expr3]
     res_shape = (shape1[0], shape2[1])
     dtype = broadcast_type_arrays(builder, (a, b))
+    if _split_reductions(builder):
+        m, n, k = literal(shape1[0]), literal(shape2[1]), literal(shape1[1])
+        split = _get_split_k(m, n, k)
+        if split > 1:
+            return _linalg_matmul2d_split_k(builder, a, b, m, n, k, split, dtype)
+
     init = builder.init_tensor(res_shape, dtype, 0)
+    if _can_use_named_matmul(builder, a, b, dtype):
+        return builder.linalg_matmul(a, b, init)
+
+    iterators = ["parallel", "parallel", "reduction"]
+    maps = [affine_map(3, (0, 2)), affine_map(3, (2, 1)), affine_map(3, (0, 1))]
 
     def body(a, b, c):
         return a * b + c
@@ -550,8 +731,13 @@ def _linalg_matmul2d(builder, a, b, shape1, shape2):
     return builder.linalg_generic((a, b), init, iterators, maps, body)
 
 
+def _can_use_mkl_gemm(builder, a, b):
+    dtype = a.dtype
+    return dtype == b.dtype and dtype in (builder.float32, builder.float64)
+
+
 def _matmul2d(builder, a, b, shape1, shape2):
-    if MKL_AVAILABLE:
+    if MKL_AVAILABLE and _can_use_mkl_gemm(builder, a, b):
         return _mkl_gemm(builder, a, b, 1, 0, shape1, shape2)
     else:
         return _linalg_matmul2d(builder, a, b, shape1, shape2)
@@ -562,10 +748,26 @@ def dot_impl(builder, a, b):
     shape1 = a.shape
     shape2 = b.shape
     if len(shape1) == 1 and len(shape2) == 1:
+        res_type = a.dtype
+        if _is_zero_dim(shape1[0]):
+            return builder.cast(0, res_type)
+
+        if (
+            _split_reductions(builder)
+            and res_type == b.dtype
+            and _can_split_reduction(builder, res_type)
+        ):
+            return _split_reduction_1d(
+                builder,
+                (a, b),
+                res_type,
+                0,
+                lambda a, b, c: a * b + c,
+                lambda a, b: a + b,
+            )
+
         iterators = ["reduction"]
-        expr1 = "(d0) -> (d0)"
-        expr2 = "(d0) -> (0)"
-        maps = [expr1, expr1, expr2]
+        maps = [identity_map(1), identity_map(1), scalar_map(1)]
         init = builder.from_elements(0, a.dtype)
 
         def body(a, b, c):
@@ -574,6 +776,11 @@ def dot_impl(builder, a, b):
         res = builder.linalg_generic((a, b), init, iterators, maps, body)
         return builder.extract(res, 0)
     if len(shape1) == 2 and len(shape2) == 2:
+        if _is_zero_dim(shape1[1]):
+            res_shape = (shape1[0], shape2[1])
+            dtype = broadcast_type_arrays(builder, (a, b))
+            return builder.init_tensor(res_shape, dtype, 0)
+
         return _matmul2d(builder, a, b, shape1, shape2)
 
 
@@ -693,11 +900,7 @@ def len_impl(builder, arg):
 
 @register_attr("array.size")
 def size_impl(builder, arg):
-    shape = arg.shape
-    res = 1
-    for i in range(len(shape)):
-        res = res * shape[i]
-    return builder.cast(res, builder.int64)
+    return builder.cast(math.prod(arg.shape), builder.int64)
 
 
 @register_func("array.copy")
@@ -746,15 +949,9 @@ def reshape_impl(builder, arg, *new_shape):
                 assert neg_index is None
                 neg_index = i
         if neg_index is not None:
-            size = 1
-            for i, s in enumerate(new_shape):
-                if i != neg_index:
-                    size = size * s
-
+            size = math.prod(new_shape[:neg_index] + new_shape[neg_index + 1 :])
             size = size_impl(builder, arg) // size
-            new_shape = list(new_shape)
-            new_shape[neg_index] = size
-            new_shape = tuple(new_shape)
+            new_shape = new_shape[:neg_index] + (size,) + new_shape[neg_index + 1 :]
 
     return builder.reshape(arg, new_shape)
 
@@ -840,12 +1037,7 @@ def atleast2d_impl(builder, arr):
     if dims == 0:
         return builder.init_tensor([1, 1], arr.dtype, arr)
     elif dims == 1:
-        init = builder.init_tensor([1, shape[0]], arr.dtype)
-        iterators = ["parallel", "parallel"]
-        expr1 = "(d0,d1) -> (d1)"
-        expr2 = "(d0,d1) -> (d0,d1)"
-        maps = [expr1, expr2]
-        return builder.linalg_generic(arr, init, iterators, maps, lambda a, b: a)
+        return builder.reshape(arr, (1, shape[0]))
     else:
         return arr
 
@@ -854,19 +1046,26 @@ def atleast2d_impl(builder, arr):
 def concat_impl(builder, arrays, axis=0):
     axis = literal(axis)
     if isinstance(axis, int):
-        shapes = [a.shape for a in arrays]
-        num_dims = len(shapes[0])
-        dtype = broadcast_type_arrays(builder, arrays)
-        new_len = sum((s[axis] for s in shapes), 0)
-        new_shape = [
-            new_len if i == axis else shapes[0][i] for i in range(len(shapes[0]))
-        ]
+        # `arrays` may be a tuple Var, which only supports integer indexing
+        arrays = tuple(arrays)
+        base_shape = arrays[0].shape
+        num_dims = len(base_shape)
+        dtype = arrays[0].dtype
+        new_len = base_shape[axis]
+        lengths = [new_len]
+        for a in arrays[1:]:
+            length = a.shape[axis]
+            lengths.append(length)
+            new_len += length
+            dtype = broadcast_type(builder, (dtype, a.dtype))
+
+        new_shape = [new_len if i == axis else base_shape[i] for i in range(num_dims)]
         res = builder.init_tensor(new_shape, dtype)
         offsets = [0] * num_dims
         strides = [1] * num_dims
-        for sizes, array in zip(shapes, arrays):
+        for length, array in zip(lengths, arrays):
             res = builder.insert(array, res, offsets, strides)
-            offsets[axis] += sizes[axis]
+            offsets[axis] += length
         return res
 
 
@@ -20,3 +20,4 @@ DPNP_AVAILABLE = (
 )  # TODO: check if dpnp library is available at runtime
 MKL_AVAILABLE = is_mkl_supported()
 OPT_LEVEL = readenv("NUMBA_MLIR_OPT_LEVEL", int, 3)
+SPLIT_REDUCTIONS = readenv("NUMBA_MLIR_SPLIT_REDUCTIONS", int, 0)
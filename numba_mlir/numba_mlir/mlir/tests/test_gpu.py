@@ -9,6 +9,8 @@ import numpy as np
 import math
 import numba
 import itertools
+from collections import defaultdict
+from functools import lru_cache
 
 from numba_mlir.mlir.utils import readenv
 from numba_mlir.kernel import *
@@ -29,6 +31,7 @@ DPCTL_TESTS_ENABLED = readenv("NUMBA_MLIR_ENABLE_DPCTL_TESTS", int, 0)
 
 if DPCTL_TESTS_ENABLED:
     import dpctl
+    import dpctl.memory
     import dpctl.tensor as dpt
 
 
@@ -42,6 +45,45 @@ def require_dpctl(func):
     )(func)
 
 
+class _HostPool:
+    # Recycle zero-filled host result arrays between tests. Every request
+    # within a test gets its own buffer, so sim and gpu results never alias.
+    def __init__(self):
+        self._free = defaultdict(list)
+        self._used = []
+
+    def zeros(self, shape, dtype):
+        if not isinstance(shape, (tuple, list)):
+            shape = (shape,)
+
+        key = (tuple(shape), np.dtype(dtype))
+        free = self._free[key]
+        if free:
+            arr = free.pop()
+            arr.fill(0)
+        else:
+            arr = np.zeros(shape, dtype)
+
+        self._used.append((key, arr))
+        return arr
+
+    def release_all(self):
+        for key, arr in self._used:
+            self._free[key].append(arr)
+
+        self._used.clear()
+
+
+_host_pool = _HostPool()
+_zeros = _host_pool.zeros
+
+
+@pytest.fixture(autouse=True)
+def _release_host_buffers():
+    yield
+    _host_pool.release_all()
+
+
 _test_values = [
     True,
     False,
@@ -72,16 +114,14 @@ def test_simple1():
         k = get_global_id(2)
         c[i, j, k] = a[i, j, k] + b[i, j, k]
 
-    sim_func = kernel_sim(func)
     gpu_func = kernel_cached(func)
 
-    a = np.array([[[1, 2, 3], [4, 5, 6]]], np.float32)
-    b = np.array([[[7, 8, 9], [10, 11, 12]]], np.float32)
+    a = np.arange(1, 7, dtype=np.float32).reshape(1, 2, 3)
+    b = np.arange(7, 13, dtype=np.float32).reshape(1, 2, 3)
 
-    sim_res = np.zeros(a.shape, a.dtype)
-    sim_func[a.shape, DEFAULT_LOCAL_SIZE](a, b, sim_res)
+    sim_res = a + b
 
-    gpu_res = np.zeros(a.shape, a.dtype)
+    gpu_res = _zeros(a.shape, a.dtype)
 
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
         gpu_func[a.shape, DEFAULT_LOCAL_SIZE](a, b, gpu_res)
@@ -102,16 +142,14 @@ def test_simple2():
         k = get_id(2)
         c[i, j, k] = a[i, j, k] + b[i, j, k]
 
-    sim_func = kernel_sim(func)
     gpu_func = kernel_cached(func)
 
-    a = np.array([[[1, 2, 3], [4, 5, 6]]], np.float32)
-    b = np.array([[[7, 8, 9], [10, 11, 12]]], np.float32)
+    a = np.arange(1, 7, dtype=np.float32).reshape(1, 2, 3)
+    b = np.arange(7, 13, dtype=np.float32).reshape(1, 2, 3)
 
-    sim_res = np.zeros(a.shape, a.dtype)
-    sim_func[a.shape, DEFAULT_LOCAL_SIZE](a, b, sim_res)
+    sim_res = a + b
 
-    gpu_res = np.zeros(a.shape, a.dtype)
+    gpu_res = _zeros(a.shape, a.dtype)
 
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
         gpu_func[a.shape, DEFAULT_LOCAL_SIZE](a, b, gpu_res)
@@ -128,15 +166,13 @@ def test_simple3():
         b[i, 0] = a[i, 0]
         b[i, 1] = a[i, 1]
 
-    sim_func = kernel_sim(func)
     gpu_func = kernel_cached(func)
 
     a = np.array([[1, 2], [3, 4], [5, 6]], np.float32)
 
-    sim_res = np.zeros(a.shape, a.dtype)
-    sim_func[a.shape[0], DEFAULT_LOCAL_SIZE](a, sim_res)
+    sim_res = a.copy()
 
-    gpu_res = np.zeros(a.shape, a.dtype)
+    gpu_res = _zeros(a.shape, a.dtype)
 
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
         gpu_func[a.shape[0], DEFAULT_LOCAL_SIZE](a, gpu_res)
@@ -146,32 +182,60 @@ def test_simple3():
     assert_equal(gpu_res, sim_res)
 
 
+# Kernels defined at module level or built by the cached _make_*_kernel
+# factories are shared between parametrizations, so only the first launch of
+# each one compiles it and prints IR. IR is checked by separate *_ir tests,
+# which compile a fresh uncached kernel once per signature instead.
+def _check_launch_ir(func, global_size, local_size, *args):
+    with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
+        kernel(func)[global_size, local_size](*args)
+        ir = get_print_buffer()
+        assert ir.count("gpu.launch blocks") == 1, ir
+
+
+def _scalar_kernel(a, b, c):
+    i = get_global_id(0)
+    c[i] = a[i] + b
+
+
 @require_gpu
 @pytest.mark.parametrize("val", _test_values)
 @pytest.mark.parametrize("dtype", [np.int32, np.int64, np.float32, np.float64])
 def test_scalar(val, dtype):
-    get_id = get_global_id
+    gpu_func = kernel_cached(_scalar_kernel)
 
-    def func(a, b, c):
-        i = get_id(0)
-        c[i] = a[i] + b
+    a = np.arange(-6, 6, dtype=dtype)
+
+    sim_res = (a + val).astype(dtype)
+
+    gpu_res = _zeros(a.shape, a.dtype)
+    gpu_func[a.shape, DEFAULT_LOCAL_SIZE](a, val, gpu_res)
+
+    assert_equal(gpu_res, sim_res)
 
-    sim_func = kernel_sim(func)
-    gpu_func = kernel_cached(func)
 
+@require_gpu
+@pytest.mark.parametrize("val", [True, 1, 2.5])
+@pytest.mark.parametrize("dtype", [np.int32, np.int64, np.float32, np.float64])
+def test_scalar_ir(val, dtype):
     a = np.arange(-6, 6, dtype=dtype)
+    gpu_res = _zeros(a.shape, a.dtype)
+    _check_launch_ir(_scalar_kernel, a.shape, DEFAULT_LOCAL_SIZE, a, val, gpu_res)
+
 
-    sim_res = np.zeros(a.shape, a.dtype)
-    sim_func[a.shape, DEFAULT_LOCAL_SIZE](a, val, sim_res)
+@require_gpu
+def test_scalar_no_recompile():
+    gpu_func = kernel_cached(_scalar_kernel)
 
-    gpu_res = np.zeros(a.shape, a.dtype)
+    a = np.arange(-6, 6, dtype=np.int32)
+    gpu_res = _zeros(a.shape, a.dtype)
+    gpu_func[a.shape, DEFAULT_LOCAL_SIZE](a, 1, gpu_res)
 
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
-        gpu_func[a.shape, DEFAULT_LOCAL_SIZE](a, val, gpu_res)
-        ir = get_print_buffer()
-        assert ir.count("gpu.launch blocks") == 1, ir
+        gpu_func[a.shape, DEFAULT_LOCAL_SIZE](a, 2, gpu_res)
+        assert is_print_buffer_empty()
 
-    assert_equal(gpu_res, sim_res)
+    assert_equal(gpu_res, a + 2)
 
 
 @require_gpu
@@ -182,7 +246,7 @@ def test_empty_kernel():
     sim_func = kernel_sim(func)
     gpu_func = kernel_cached(func)
 
-    a = np.array([[[1, 2, 3], [4, 5, 6]]], np.float32)
+    a = np.arange(1, 7, dtype=np.float32).reshape(1, 2, 3)
     sim_func[a.shape, DEFAULT_LOCAL_SIZE](a)
 
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
@@ -197,18 +261,16 @@ def test_list_args():
         i = get_global_id(0)
         c[i] = a[i] + b[i]
 
-    sim_func = kernel_sim(func)
     gpu_func = kernel_cached(func)
 
-    a = np.array([1, 2, 3, 4, 5, 6], np.float32)
-    b = np.array([7, 8, 9, 10, 11, 12], np.float32)
+    a = np.arange(1, 7, dtype=np.float32)
+    b = np.arange(7, 13, dtype=np.float32)
 
-    sim_res = np.zeros(a.shape, a.dtype)
+    sim_res = a + b
 
     dims = [a.shape[0]]
-    sim_func[dims, []](a, b, sim_res)
 
-    gpu_res = np.zeros(a.shape, a.dtype)
+    gpu_res = _zeros(a.shape, a.dtype)
 
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
         gpu_func[dims, []](a, b, gpu_res)
@@ -233,10 +295,10 @@ def test_slice():
 
     a = np.arange(3 * 4 * 5).reshape((3, 4, 5))
 
-    sim_res = np.zeros(a.shape, a.dtype)
+    sim_res = _zeros(a.shape, a.dtype)
     sim_func[a.shape, DEFAULT_LOCAL_SIZE](a, sim_res)
 
-    gpu_res = np.zeros(a.shape, a.dtype)
+    gpu_res = _zeros(a.shape, a.dtype)
 
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
         gpu_func[a.shape, DEFAULT_LOCAL_SIZE](a, gpu_res)
@@ -261,10 +323,10 @@ def test_inner_loop():
     a = np.array([1, 2, 3, 4], np.int32)
     b = np.array([5, 6, 7, 8, 9], np.float32)
 
-    sim_res = np.zeros(a.shape, b.dtype)
+    sim_res = _zeros(a.shape, b.dtype)
     sim_func[a.shape, DEFAULT_LOCAL_SIZE](a, b, sim_res)
 
-    gpu_res = np.zeros(a.shape, b.dtype)
+    gpu_res = _zeros(a.shape, b.dtype)
 
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
         gpu_func[a.shape, DEFAULT_LOCAL_SIZE](a, b, gpu_res)
@@ -274,16 +336,14 @@ def test_inner_loop():
     assert_equal(gpu_res, sim_res)
 
 
-def _test_unary(func, dtype, ir_pass, ir_check):
-    sim_func = kernel_sim(func)
+def _test_unary(func, ref_func, dtype, ir_pass, ir_check):
     gpu_func = kernel_cached(func)
 
-    a = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9], dtype)
+    a = np.arange(1, 10, dtype=dtype)
 
-    sim_res = np.zeros(a.shape, dtype)
-    sim_func[a.shape, DEFAULT_LOCAL_SIZE](a, sim_res)
+    sim_res = ref_func(a).astype(dtype)
 
-    gpu_res = np.zeros(a.shape, dtype)
+    gpu_res = _zeros(a.shape, dtype)
 
     with print_pass_ir([], [ir_pass]):
         gpu_func[a.shape, DEFAULT_LOCAL_SIZE](a, gpu_res)
@@ -293,17 +353,15 @@ def _test_unary(func, dtype, ir_pass, ir_check):
     assert_allclose(gpu_res, sim_res, rtol=1e-5)
 
 
-def _test_binary(func, dtype, ir_pass, ir_check):
-    sim_func = kernel_sim(func)
+def _test_binary(func, ref_func, dtype, ir_pass, ir_check):
     gpu_func = kernel_cached(func)
 
-    a = np.array([11, 12, 13, 14, 15], dtype)
-    b = np.array([1, 2, 3, 4, 5], dtype)
+    a = np.arange(11, 16, dtype=dtype)
+    b = np.arange(1, 6, dtype=dtype)
 
-    sim_res = np.zeros(a.shape, dtype)
-    sim_func[a.shape, DEFAULT_LOCAL_SIZE](a, b, sim_res)
+    sim_res = ref_func(a, b).astype(dtype)
 
-    gpu_res = np.zeros(a.shape, dtype)
+    gpu_res = _zeros(a.shape, dtype)
 
     with print_pass_ir([], [ir_pass]):
         gpu_func[a.shape, DEFAULT_LOCAL_SIZE](a, b, gpu_res)
@@ -323,7 +381,11 @@ def test_math_funcs_unary(op):
         b[i] = f(a[i])
 
     _test_unary(
-        func, np.float32, "GPUToSpirvPass", lambda ir: ir.count(f"CL.{op}") == 1
+        func,
+        getattr(np, op),
+        np.float32,
+        "GPUToSpirvPass",
+        lambda ir: ir.count(f"CL.{op}") == 1,
     )
 
 
@@ -340,6 +402,7 @@ def test_gpu_ops_binary(op, dtype):
 
     _test_binary(
         func,
+        f,
         dtype,
         "ConvertParallelLoopToGpu",
         lambda ir: ir.count(f"gpu.launch blocks") == 1,
@@ -356,118 +419,48 @@ _test_shapes = [
 ]
 
 
-@require_gpu
-@pytest.mark.parametrize("shape", _test_shapes)
-def test_get_global_id(shape):
-    def func1(c):
-        i = get_global_id(0)
-        c[i] = i
-
-    def func2(c):
-        i = get_global_id(0)
-        j = get_global_id(1)
-        c[i, j] = i + j * 100
-
-    def func3(c):
-        i = get_global_id(0)
-        j = get_global_id(1)
-        k = get_global_id(2)
-        c[i, j, k] = i + j * 100 + k * 10000
-
-    func = [func1, func2, func3][len(shape) - 1]
-
-    sim_func = kernel_sim(func)
-    gpu_func = kernel_cached(func)
-
-    dtype = np.int32
-
-    sim_res = np.zeros(shape, dtype)
-    sim_func[shape, DEFAULT_LOCAL_SIZE](sim_res)
-
-    gpu_res = np.zeros(shape, dtype)
-
-    with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
-        gpu_func[shape, DEFAULT_LOCAL_SIZE](gpu_res)
-        ir = get_print_buffer()
-        assert ir.count("gpu.launch blocks") == 1, ir
-
-    assert_equal(gpu_res, sim_res)
-
-
-@require_gpu
-@pytest.mark.parametrize("shape", _test_shapes)
-@pytest.mark.parametrize("lsize", [(1, 1, 1), (2, 4, 8)])
-def test_get_local_id(shape, lsize):
-    def func1(c):
-        i = get_global_id(0)
-        li = get_local_id(0)
-        c[i] = li
-
-    def func2(c):
-        i = get_global_id(0)
-        j = get_global_id(1)
-        li = get_local_id(0)
-        lj = get_local_id(1)
-        c[i, j] = li + lj * 100
-
-    def func3(c):
-        i = get_global_id(0)
-        j = get_global_id(1)
-        k = get_global_id(2)
-        li = get_local_id(0)
-        lj = get_local_id(1)
-        lk = get_local_id(2)
-        c[i, j, k] = li + lj * 100 + lk * 10000
-
-    func = [func1, func2, func3][len(shape) - 1]
-
-    sim_func = kernel_sim(func)
-    gpu_func = kernel_cached(func)
-
-    dtype = np.int32
-
-    if len(lsize) > len(shape):
-        lsize = tuple(lsize[: len(shape)])
-
-    sim_res = np.zeros(shape, dtype)
-    sim_func[shape, lsize](sim_res)
-
-    gpu_res = np.zeros(shape, dtype)
+def _item_ids_kernel1(c):
+    i = get_global_id(0)
+    c[i, 0] = i
+    c[i, 1] = get_local_id(0)
+    c[i, 2] = get_group_id(0)
+    c[i, 3] = get_global_size(0)
+    c[i, 4] = get_local_size(0)
+
+
+def _item_ids_kernel2(c):
+    i = get_global_id(0)
+    j = get_global_id(1)
+    c[i, j, 0] = i + j * 100
+    c[i, j, 1] = get_local_id(0) + get_local_id(1) * 100
+    c[i, j, 2] = get_group_id(0) + get_group_id(1) * 100
+    c[i, j, 3] = get_global_size(0) + get_global_size(1) * 100
+    c[i, j, 4] = get_local_size(0) + get_local_size(1) * 100
+
+
+def _item_ids_kernel3(c):
+    i = get_global_id(0)
+    j = get_global_id(1)
+    k = get_global_id(2)
+    c[i, j, k, 0] = i + j * 100 + k * 10000
+    c[i, j, k, 1] = get_local_id(0) + get_local_id(1) * 100 + get_local_id(2) * 10000
+    c[i, j, k, 2] = get_group_id(0) + get_group_id(1) * 100 + get_group_id(2) * 10000
+    c[i, j, k, 3] = (
+        get_global_size(0) + get_global_size(1) * 100 + get_global_size(2) * 10000
+    )
+    c[i, j, k, 4] = (
+        get_local_size(0) + get_local_size(1) * 100 + get_local_size(2) * 10000
+    )
 
-    with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
-        gpu_func[shape, lsize](gpu_res)
-        ir = get_print_buffer()
-        assert ir.count("gpu.launch blocks") == 1, ir
 
-    assert_equal(gpu_res, sim_res)
+_item_ids_kernels = [_item_ids_kernel1, _item_ids_kernel2, _item_ids_kernel3]
 
 
 @require_gpu
 @pytest.mark.parametrize("shape", _test_shapes)
-@pytest.mark.parametrize("lsize", [(1, 1, 1), (2, 4, 8)])
-def test_get_group_id(shape, lsize):
-    def func1(c):
-        i = get_global_id(0)
-        li = get_group_id(0)
-        c[i] = li
-
-    def func2(c):
-        i = get_global_id(0)
-        j = get_global_id(1)
-        li = get_group_id(0)
-        lj = get_group_id(1)
-        c[i, j] = li + lj * 100
-
-    def func3(c):
-        i = get_global_id(0)
-        j = get_global_id(1)
-        k = get_global_id(2)
-        li = get_group_id(0)
-        lj = get_group_id(1)
-        lk = get_group_id(2)
-        c[i, j, k] = li + lj * 100 + lk * 10000
-
-    func = [func1, func2, func3][len(shape) - 1]
+@pytest.mark.parametrize("lsize", [DEFAULT_LOCAL_SIZE, (1, 1, 1), (2, 4, 8)])
+def test_get_item_ids(shape, lsize):
+    func = _item_ids_kernels[len(shape) - 1]
 
     sim_func = kernel_sim(func)
     gpu_func = kernel_cached(func)
@@ -477,109 +470,25 @@ def test_get_group_id(shape, lsize):
     if len(lsize) > len(shape):
         lsize = tuple(lsize[: len(shape)])
 
-    sim_res = np.zeros(shape, dtype)
+    res_shape = shape + (5,)
+    sim_res = _zeros(res_shape, dtype)
     sim_func[shape, lsize](sim_res)
 
-    gpu_res = np.zeros(shape, dtype)
-
-    with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
-        gpu_func[shape, lsize](gpu_res)
-        ir = get_print_buffer()
-        assert ir.count("gpu.launch blocks") == 1, ir
+    gpu_res = _zeros(res_shape, dtype)
+    gpu_func[shape, lsize](gpu_res)
 
-    assert_equal(gpu_res, sim_res)
+    for i in range(res_shape[-1]):
+        assert_equal(gpu_res[..., i], sim_res[..., i])
 
 
 @require_gpu
-@pytest.mark.parametrize("shape", _test_shapes)
-def test_get_global_size(shape):
-    def func1(c):
-        i = get_global_id(0)
-        w = get_global_size(0)
-        c[i] = w
-
-    def func2(c):
-        i = get_global_id(0)
-        j = get_global_id(1)
-        w = get_global_size(0)
-        h = get_global_size(1)
-        c[i, j] = w + h * 100
-
-    def func3(c):
-        i = get_global_id(0)
-        j = get_global_id(1)
-        k = get_global_id(2)
-        w = get_global_size(0)
-        h = get_global_size(1)
-        d = get_global_size(2)
-        c[i, j, k] = w + h * 100 + d * 10000
-
-    func = [func1, func2, func3][len(shape) - 1]
-
-    sim_func = kernel_sim(func)
-    gpu_func = kernel_cached(func)
-
-    dtype = np.int32
-
-    sim_res = np.zeros(shape, dtype)
-    sim_func[shape, DEFAULT_LOCAL_SIZE](sim_res)
-
-    gpu_res = np.zeros(shape, dtype)
-
-    with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
-        gpu_func[shape, DEFAULT_LOCAL_SIZE](gpu_res)
-        ir = get_print_buffer()
-        assert ir.count("gpu.launch blocks") == 1, ir
-
-    assert_equal(gpu_res, sim_res)
-
-
-@require_gpu
-@pytest.mark.parametrize("shape", _test_shapes)
-@pytest.mark.parametrize("lsize", [(1, 1, 1), (2, 4, 8)])
-def test_get_local_size(shape, lsize):
-    def func1(c):
-        i = get_global_id(0)
-        w = get_local_size(0)
-        c[i] = w
-
-    def func2(c):
-        i = get_global_id(0)
-        j = get_global_id(1)
-        w = get_local_size(0)
-        h = get_local_size(1)
-        c[i, j] = w + h * 100
-
-    def func3(c):
-        i = get_global_id(0)
-        j = get_global_id(1)
-        k = get_global_id(2)
-        w = get_local_size(0)
-        h = get_local_size(1)
-        d = get_local_size(2)
-        c[i, j, k] = w + h * 100 + d * 10000
-
-    func = [func1, func2, func3][len(shape) - 1]
-
-    sim_func = kernel_sim(func)
-    gpu_func = kernel_cached(func)
-
-    dtype = np.int32
-
-    if len(lsize) > len(shape):
-        lsize = tuple(lsize[: len(shape)])
-
-    sim_res = np.zeros(shape, dtype)
-    sim_func[shape, lsize](sim_res)
-
-    gpu_res = np.zeros(shape, dtype)
-
-    with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
-        gpu_func[shape, lsize](gpu_res)
-        ir = get_print_buffer()
-        assert ir.count("gpu.launch blocks") == 1, ir
-
-    assert_equal(gpu_res, sim_res)
+@pytest.mark.parametrize("ndim", [1, 2, 3])
+@pytest.mark.parametrize("lsize", [DEFAULT_LOCAL_SIZE, (1, 1, 1)])
+def test_get_item_ids_ir(ndim, lsize):
+    shape = (7, 13, 23)[:ndim]
+    lsize = tuple(lsize[:ndim])
+    gpu_res = _zeros(shape + (5,), np.int32)
+    _check_launch_ir(_item_ids_kernels[ndim - 1], shape, lsize, gpu_res)
 
 
 _atomic_dtypes = ["int32", "int64", "float32"]
@@ -598,12 +507,12 @@ def _test_atomic(func, dtype, ret_size):
     sim_func = kernel_sim(func)
     gpu_func = kernel_cached(func)
 
-    a = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9], dtype)
+    a = np.arange(1, 10, dtype=dtype)
 
-    sim_res = np.zeros([ret_size], dtype)
+    sim_res = _zeros([ret_size], dtype)
     sim_func[a.shape, DEFAULT_LOCAL_SIZE](a, sim_res)
 
-    gpu_res = np.zeros([ret_size], dtype)
+    gpu_res = _zeros([ret_size], dtype)
 
     with print_pass_ir([], ["GPUToSpirvPass"]):
         gpu_func[a.shape, DEFAULT_LOCAL_SIZE](a, gpu_res)
@@ -613,15 +522,20 @@ def _test_atomic(func, dtype, ret_size):
     assert_equal(gpu_res, sim_res)
 
 
-@require_gpu
-@pytest.mark.parametrize("dtype", _atomic_dtypes)
-@pytest.mark.parametrize("atomic_op", _atomic_funcs)
-def test_atomics(dtype, atomic_op):
+@lru_cache(maxsize=None)
+def _make_atomics_kernel(atomic_op):
     def func(a, b):
         i = get_global_id(0)
         atomic_op(b, 0, a[i])
 
-    _test_atomic(func, dtype, 1)
+    return func
+
+
+@require_gpu
+@pytest.mark.parametrize("dtype", _atomic_dtypes)
+@pytest.mark.parametrize("atomic_op", _atomic_funcs)
+def test_atomics(dtype, atomic_op):
+    _test_atomic(_make_atomics_kernel(atomic_op), dtype, 1)
 
 
 @require_gpu
@@ -692,10 +606,10 @@ def test_atomics_multidim(funci):
 
     a = np.array([[1, 2, 3], [4, 5, 6], [7, 8, 9]], dtype)
 
-    sim_res = np.zeros((2, 2), dtype)
+    sim_res = _zeros((2, 2), dtype)
     sim_func[a.shape, DEFAULT_LOCAL_SIZE](a, sim_res)
 
-    gpu_res = np.zeros((2, 2), dtype)
+    gpu_res = _zeros((2, 2), dtype)
 
     with print_pass_ir([], ["GPUToSpirvPass"]):
         gpu_func[a.shape, DEFAULT_LOCAL_SIZE](a, gpu_res)
@@ -712,15 +626,15 @@ def test_fastmath():
         res[i] = a[i] * b[i] + c[i]
 
     sim_func = kernel_sim(func)
-    a = np.array([1, 2, 3, 4], np.float32)
-    b = np.array([5, 6, 7, 8], np.float32)
-    c = np.array([9, 10, 11, 12], np.float32)
+    a = np.arange(1, 5, dtype=np.float32)
+    b = np.arange(5, 9, dtype=np.float32)
+    c = np.arange(9, 13, dtype=np.float32)
 
-    sim_res = np.zeros(a.shape, a.dtype)
+    sim_res = _zeros(a.shape, a.dtype)
     sim_func[a.shape, DEFAULT_LOCAL_SIZE](a, b, c, sim_res)
 
     with print_pass_ir([], ["GPUToSpirvPass"]):
-        gpu_res = np.zeros(a.shape, a.dtype)
+        gpu_res = _zeros(a.shape, a.dtype)
         gpu_func = kernel(fastmath=False)(func)
         gpu_func[a.shape, DEFAULT_LOCAL_SIZE](a, b, c, gpu_res)
         ir = get_print_buffer()
@@ -728,7 +642,7 @@ def test_fastmath():
         assert_equal(gpu_res, sim_res)
 
     with print_pass_ir([], ["GPUToSpirvPass"]):
-        gpu_res = np.zeros(a.shape, a.dtype)
+        gpu_res = _zeros(a.shape, a.dtype)
         gpu_func = kernel(fastmath=True)(func)
         gpu_func[a.shape, DEFAULT_LOCAL_SIZE](a, b, c, gpu_res)
         ir = get_print_buffer()
@@ -747,11 +661,11 @@ def test_input_load_cse():
     sim_func = kernel_sim(func)
     gpu_func = kernel_cached(func)
 
-    a = np.array([[[1, 2, 3], [4, 5, 6]]], np.float32)
-    sim_res = np.zeros(a.shape, a.dtype)
+    a = np.arange(1, 7, dtype=np.float32).reshape(1, 2, 3)
+    sim_res = _zeros(a.shape, a.dtype)
     sim_func[a.shape, DEFAULT_LOCAL_SIZE](sim_res)
 
-    gpu_res = np.zeros(a.shape, a.dtype)
+    gpu_res = _zeros(a.shape, a.dtype)
 
     with print_pass_ir(["SerializeSPIRVPass"], []):
         gpu_func[a.shape, DEFAULT_LOCAL_SIZE](gpu_res)
@@ -766,42 +680,50 @@ def test_input_load_cse():
     assert_equal(gpu_res, sim_res)
 
 
+@lru_cache(maxsize=None)
+def _make_barrier_ops_kernel(op, flags):
+    def func(a, b):
+        i = get_global_id(0)
+        v = a[i]
+        op(flags)
+        b[i] = a[i]
+
+    return func
+
+
 @require_gpu
 @pytest.mark.parametrize("op", [barrier, mem_fence])
 @pytest.mark.parametrize("flags", [CLK_LOCAL_MEM_FENCE, CLK_GLOBAL_MEM_FENCE])
 @pytest.mark.parametrize("global_size", [1, 2, 27, 67, 101])
 @pytest.mark.parametrize("local_size", [1, 2, 7, 17, 33])
 def test_barrier_ops(op, flags, global_size, local_size):
-    atomic_add = atomic.add
-
-    def func(a, b):
-        i = get_global_id(0)
-        v = a[i]
-        op(flags)
-        b[i] = a[i]
+    func = _make_barrier_ops_kernel(op, flags)
 
     sim_func = kernel_sim(func)
     gpu_func = kernel_cached(func)
 
     a = np.arange(global_size, dtype=np.int64)
 
-    sim_res = np.zeros(global_size, a.dtype)
+    sim_res = _zeros(global_size, a.dtype)
     sim_func[global_size, local_size](a, sim_res)
 
-    gpu_res = np.zeros(global_size, a.dtype)
-
-    with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
-        gpu_func[global_size, local_size](a, gpu_res)
-        ir = get_print_buffer()
-        assert ir.count("gpu.launch blocks") == 1, ir
+    gpu_res = _zeros(global_size, a.dtype)
+    gpu_func[global_size, local_size](a, gpu_res)
 
     assert_equal(gpu_res, sim_res)
 
 
 @require_gpu
-@pytest.mark.parametrize("global_size", [1, 2, 4, 27, 67, 101])
-@pytest.mark.parametrize("local_size", [1, 2, 7, 17, 33])
-def test_barrier1(global_size, local_size):
+@pytest.mark.parametrize("op", [barrier, mem_fence])
+@pytest.mark.parametrize("flags", [CLK_LOCAL_MEM_FENCE, CLK_GLOBAL_MEM_FENCE])
+def test_barrier_ops_ir(op, flags):
+    a = np.arange(27, dtype=np.int64)
+    gpu_res = _zeros(a.shape, a.dtype)
+    _check_launch_ir(_make_barrier_ops_kernel(op, flags), 27, 7, a, gpu_res)
+
+
+@lru_cache(maxsize=None)
+def _make_barrier1_kernel(local_size):
     atomic_add = atomic.add
 
     def func(a, b):
@@ -811,25 +733,42 @@ def test_barrier1(global_size, local_size):
         barrier(CLK_GLOBAL_MEM_FENCE)
         b[i] = a[off]
 
+    return func
+
+
+@require_gpu
+@pytest.mark.parametrize("global_size", [1, 2, 4, 27, 67, 101])
+@pytest.mark.parametrize("local_size", [1, 2, 7, 17, 33])
+def test_barrier1(global_size, local_size):
+    func = _make_barrier1_kernel(local_size)
+
     sim_func = kernel_sim(func)
     gpu_func = kernel_cached(func)
 
     count = (global_size + local_size - 1) // local_size
-    a = np.array([0] * count, np.int64)
-
-    sim_res = np.zeros(global_size, a.dtype)
-    sim_func[global_size, local_size](a.copy(), sim_res)
+    dtype = np.int64
 
-    gpu_res = np.zeros(global_size, a.dtype)
+    sim_res = _zeros(global_size, dtype)
+    sim_func[global_size, local_size](_zeros(count, dtype), sim_res)
 
-    with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
-        gpu_func[global_size, local_size](a.copy(), gpu_res)
-        ir = get_print_buffer()
-        assert ir.count("gpu.launch blocks") == 1, ir
+    gpu_res = _zeros(global_size, dtype)
+    gpu_func[global_size, local_size](_zeros(count, dtype), gpu_res)
 
     assert_equal(gpu_res, sim_res)
 
 
+@require_gpu
+@pytest.mark.parametrize("local_size", [1, 2, 7, 17, 33])
+def test_barrier1_ir(local_size):
+    global_size = 67
+    count = (global_size + local_size - 1) // local_size
+    dtype = np.int64
+
+    func = _make_barrier1_kernel(local_size)
+    args = (_zeros(count, dtype), _zeros(global_size, dtype))
+    _check_launch_ir(func, global_size, local_size, *args)
+
+
 @require_gpu
 @pytest.mark.parametrize("blocksize", [1, 10, 17, 64, 67, 101])
 def test_local_memory(blocksize):
@@ -892,41 +831,100 @@ def test_private_memory(blocksize):
     assert_allclose(sim_res, gpu_res)
 
 
+@lru_cache(maxsize=None)
+def _make_group_kernel(group_op):
+    def func(a, b):
+        i = get_global_id(0)
+        v = group_op(a[i])
+        b[i] = v
+
+    return func
+
+
 @require_gpu
 @pytest.mark.parametrize("group_op", [group.reduce_add])
 @pytest.mark.parametrize("global_size", [1, 2, 4, 27, 67, 101])
 @pytest.mark.parametrize("local_size", [1, 2, 7, 17, 33])
 @pytest.mark.parametrize("dtype", [np.int32, np.int64, np.float32])
 def test_group_func(group_op, global_size, local_size, dtype):
-    def func(a, b):
-        i = get_global_id(0)
-        v = group_op(a[i])
-        b[i] = v
+    func = _make_group_kernel(group_op)
 
     sim_func = kernel_sim(func)
     gpu_func = kernel_cached(func)
 
     a = np.arange(global_size, dtype=dtype)
 
-    sim_res = np.zeros(global_size, a.dtype)
+    sim_res = _zeros(global_size, a.dtype)
     sim_func[global_size, local_size](a, sim_res)
 
-    gpu_res = np.zeros(global_size, a.dtype)
-
-    with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
-        gpu_func[global_size, local_size](a, gpu_res)
-        ir = get_print_buffer()
-        assert ir.count("gpu.launch blocks") == 1, ir
+    gpu_res = _zeros(global_size, a.dtype)
+    gpu_func[global_size, local_size](a, gpu_res)
 
     assert_allclose(gpu_res, sim_res)
 
 
+@require_gpu
+@pytest.mark.parametrize("group_op", [group.reduce_add])
+@pytest.mark.parametrize("dtype", [np.int32, np.int64, np.float32])
+def test_group_func_ir(group_op, dtype):
+    a = np.arange(27, dtype=dtype)
+    gpu_res = _zeros(a.shape, a.dtype)
+    _check_launch_ir(_make_group_kernel(group_op), 27, 7, a, gpu_res)
+
+
+class _USMPool:
+    # USM allocations are expensive, recycle them between tests instead.
+    # Buckets are exact sizes, as usm_data copies require matching sizes.
+    def __init__(self):
+        self._free = defaultdict(list)
+        self._used = []
+
+    def alloc(self, nbytes, buffer):
+        key = (nbytes, buffer)
+        free = self._free[key]
+        if free:
+            mem = free.pop()
+        else:
+            mem_types = {
+                "device": dpctl.memory.MemoryUSMDevice,
+                "shared": dpctl.memory.MemoryUSMShared,
+                "host": dpctl.memory.MemoryUSMHost,
+            }
+            mem = mem_types[buffer](nbytes)
+
+        self._used.append((key, mem))
+        return mem
+
+    def release_all(self):
+        for key, mem in self._used:
+            self._free[key].append(mem)
+
+        self._used.clear()
+
+
+_usm_pool = _USMPool()
+
+
+@pytest.fixture(autouse=True)
+def _release_usm_buffers():
+    yield
+    _usm_pool.release_all()
+
+
 def _from_host(arr, buffer):
-    ret = dpt.usm_ndarray(arr.shape, dtype=arr.dtype, buffer=buffer)
+    mem = _usm_pool.alloc(arr.nbytes, buffer)
+    ret = dpt.usm_ndarray(arr.shape, dtype=arr.dtype, buffer=mem)
     ret.usm_data.copy_from_host(arr.reshape((-1)).view("|u1"))
     return ret
 
 
+# Arrays are allocated on the default device, query its filter string once.
+@lru_cache(maxsize=None)
+def _gpu_region_desc():
+    filter_string = dpctl.SyclDevice().filter_string
+    return f'numba_util.env_region #gpu_runtime.region_desc<device = "{filter_string}">'
+
+
 def _to_host(src, dst):
     src.usm_data.copy_to_host(dst.reshape((-1)).view("|u1"))
 
@@ -938,31 +936,23 @@ def test_dpctl_simple1():
         i = get_global_id(0)
         c[i] = a[i] + b[i]
 
-    sim_func = kernel_sim(func)
     gpu_func = kernel_cached(func)
 
     a = np.arange(1024, dtype=np.float32)
     b = np.arange(1024, dtype=np.float32) * 3
 
-    sim_res = np.zeros(a.shape, a.dtype)
-    sim_func[a.shape, DEFAULT_LOCAL_SIZE](a, b, sim_res)
+    sim_res = a + b
 
     da = _from_host(a, buffer="device")
     db = _from_host(b, buffer="shared")
 
-    gpu_res = np.zeros(a.shape, a.dtype)
+    gpu_res = _zeros(a.shape, a.dtype)
     dgpu_res = _from_host(gpu_res, buffer="device")
 
-    filter_string = dgpu_res.device.sycl_device.filter_string
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
         gpu_func[a.shape, DEFAULT_LOCAL_SIZE](da, db, dgpu_res)
         ir = get_print_buffer()
-        assert (
-            ir.count(
-                f'numba_util.env_region #gpu_runtime.region_desc<device = "{filter_string}">'
-            )
-            > 0
-        ), ir
+        assert ir.count(_gpu_region_desc()) > 0, ir
         assert ir.count("gpu.launch blocks") == 1, ir
 
     _to_host(dgpu_res, gpu_res)
@@ -981,25 +971,18 @@ def test_parfor_simple1():
     a = np.arange(1024, dtype=np.float32)
     b = np.arange(1024, dtype=np.float32) * 3
 
-    sim_res = np.zeros(a.shape, a.dtype)
-    py_func(a, b, sim_res)
+    sim_res = a + b
 
     da = _from_host(a, buffer="device")
     db = _from_host(b, buffer="shared")
 
-    gpu_res = np.zeros(a.shape, a.dtype)
+    gpu_res = _zeros(a.shape, a.dtype)
     dgpu_res = _from_host(gpu_res, buffer="device")
 
-    filter_string = dgpu_res.device.sycl_device.filter_string
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
         gpu_func(da, db, dgpu_res)
         ir = get_print_buffer()
-        assert (
-            ir.count(
-                f'numba_util.env_region #gpu_runtime.region_desc<device = "{filter_string}">'
-            )
-            > 0
-        ), ir
+        assert ir.count(_gpu_region_desc()) > 0, ir
         assert ir.count("gpu.launch blocks") == 1, ir
 
     _to_host(dgpu_res, gpu_res)
@@ -1016,24 +999,18 @@ def test_cfd_simple1():
 
     a = np.arange(1024, dtype=np.float32)
 
-    sim_res = np.zeros(a.shape, a.dtype)
+    sim_res = _zeros(a.shape, a.dtype)
     py_func(a, sim_res)
 
     da = _from_host(a, buffer="device")
 
-    gpu_res = np.zeros(a.shape, a.dtype)
+    gpu_res = _zeros(a.shape, a.dtype)
     dgpu_res = _from_host(gpu_res, buffer="device")
 
-    filter_string = dgpu_res.device.sycl_device.filter_string
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
         jit_func(da, dgpu_res)
         ir = get_print_buffer()
-        assert (
-            ir.count(
-                f'numba_util.env_region #gpu_runtime.region_desc<device = "{filter_string}">'
-            )
-            > 0
-        ), ir
+        assert ir.count(_gpu_region_desc()) > 0, ir
         assert ir.count("gpu.launch blocks") == 1, ir
 
     _to_host(dgpu_res, gpu_res)
@@ -1051,31 +1028,50 @@ def test_cfd_simple2():
     a = np.arange(1024, dtype=np.float32)
     b = np.arange(1024, dtype=np.float32) * 3
 
-    sim_res = np.zeros(a.shape, a.dtype)
+    sim_res = _zeros(a.shape, a.dtype)
     py_func(a, b, sim_res)
 
     da = _from_host(a, buffer="device")
     db = _from_host(b, buffer="shared")
 
-    gpu_res = np.zeros(a.shape, a.dtype)
+    gpu_res = _zeros(a.shape, a.dtype)
     dgpu_res = _from_host(gpu_res, buffer="device")
 
-    filter_string = dgpu_res.device.sycl_device.filter_string
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
         jit_func(da, db, dgpu_res)
         ir = get_print_buffer()
-        assert (
-            ir.count(
-                f'numba_util.env_region #gpu_runtime.region_desc<device = "{filter_string}">'
-            )
-            > 0
-        ), ir
+        assert ir.count(_gpu_region_desc()) > 0, ir
         assert ir.count("gpu.launch blocks") > 0, ir
 
     _to_host(dgpu_res, gpu_res)
     assert_equal(gpu_res, sim_res)
 
 
+@require_dpctl
+def test_cfd_simple_4d():
+    def py_func(a, b):
+        b[:] = a * 2
+
+    jit_func = njit(py_func)
+
+    a = np.arange(2 * 3 * 4 * 5, dtype=np.float32).reshape(2, 3, 4, 5)
+
+    sim_res = a * 2
+
+    da = _from_host(a, buffer="device")
+
+    gpu_res = _zeros(a.shape, a.dtype)
+    dgpu_res = _from_host(gpu_res, buffer="device")
+
+    with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
+        jit_func(da, dgpu_res)
+        ir = get_print_buffer()
+        assert ir.count("gpu.launch blocks") == 1, ir
+
+    _to_host(dgpu_res, gpu_res)
+    assert_equal(gpu_res, sim_res)
+
+
 @require_dpctl
 def test_cfd_indirect():
     def py_func1(a, b):
@@ -1090,24 +1086,18 @@ def test_cfd_indirect():
 
     a = np.arange(1024, dtype=np.float32)
 
-    sim_res = np.zeros(a.shape, a.dtype)
+    sim_res = _zeros(a.shape, a.dtype)
     py_func2(a, sim_res)
 
     da = _from_host(a, buffer="device")
 
-    gpu_res = np.zeros(a.shape, a.dtype)
+    gpu_res = _zeros(a.shape, a.dtype)
     dgpu_res = _from_host(gpu_res, buffer="device")
 
-    filter_string = dgpu_res.device.sycl_device.filter_string
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
         jit_func2(da, dgpu_res)
         ir = get_print_buffer()
-        assert (
-            ir.count(
-                f'numba_util.env_region #gpu_runtime.region_desc<device = "{filter_string}">'
-            )
-            > 0
-        ), ir
+        assert ir.count(_gpu_region_desc()) > 0, ir
         assert ir.count("gpu.launch blocks") > 0, ir
 
     _to_host(dgpu_res, gpu_res)
@@ -1127,39 +1117,37 @@ def test_cfd_reshape():
 
     jit_func2 = njit(py_func2)
 
-    a = np.arange(17 * 23 * 56, dtype=np.float32).reshape(23, 56, 17).copy()
+    shape = (23, 56, 17)
+    dtype = np.float32
 
-    sim_res = np.zeros(a.shape, a.dtype)
+    sim_res = _zeros(shape, dtype)
     py_func2(sim_res)
 
-    da = _from_host(a, buffer="device")
-
-    gpu_res = np.zeros(a.shape, a.dtype)
+    gpu_res = _zeros(shape, dtype)
     dgpu_res = _from_host(gpu_res, buffer="device")
 
-    filter_string = dgpu_res.device.sycl_device.filter_string
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
         jit_func2(dgpu_res)
         ir = get_print_buffer()
-        assert (
-            ir.count(
-                f'numba_util.env_region #gpu_runtime.region_desc<device = "{filter_string}">'
-            )
-            > 0
-        ), ir
+        assert ir.count(_gpu_region_desc()) > 0, ir
         assert ir.count("gpu.launch blocks") > 0, ir
     _to_host(dgpu_res, gpu_res)
     assert_equal(gpu_res, sim_res)
 
 
+# TODO: Handle gpu array access outside the loops
+_unit_dim_xfail = pytest.mark.xfail(
+    reason="gpu array access outside the loops", run=False
+)
+
+
 @pytest.mark.smoke
 @require_dpctl
-@pytest.mark.parametrize("size", [1, 7, 16, 64, 65, 256, 512, 1024 * 1024])
+@pytest.mark.parametrize(
+    "size",
+    [pytest.param(1, marks=_unit_dim_xfail), 7, 16, 64, 65, 256, 512, 1024 * 1024],
+)
 def test_cfd_reduce1(size):
-    if size == 1:
-        # TODO: Handle gpu array access outside the loops
-        pytest.xfail()
-
     py_func = lambda a: a.sum()
     jit_func = njit(py_func)
 
@@ -1167,20 +1155,40 @@ def test_cfd_reduce1(size):
 
     da = _from_host(a, buffer="device")
 
-    filter_string = da.device.sycl_device.filter_string
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
         assert_allclose(jit_func(da), py_func(a), rtol=1e-5)
         ir = get_print_buffer()
-        assert (
-            ir.count(
-                f'numba_util.env_region #gpu_runtime.region_desc<device = "{filter_string}">'
-            )
-            > 0
-        ), ir
+        assert ir.count(_gpu_region_desc()) > 0, ir
         assert ir.count("gpu.launch blocks") == 1, ir
 
 
 _shapes = (1, 7, 16, 25, 64, 65)
+_shape_pairs = [
+    pytest.param(s, marks=_unit_dim_xfail) if 1 in s else s
+    for s in itertools.product(_shapes, _shapes)
+]
+
+
+@pytest.fixture(scope="module")
+def arange_arrays():
+    # Read-only (host, device) arange inputs shared between tests. Device
+    # buffers are allocated outside of _usm_pool as they outlive a test.
+    cache = {}
+
+    def get(shape, dtype):
+        key = (shape, np.dtype(dtype))
+        res = cache.get(key)
+        if res is None:
+            a = np.arange(math.prod(shape), dtype=dtype).reshape(shape)
+            da = dpt.usm_ndarray(a.shape, dtype=a.dtype, buffer="device")
+            da.usm_data.copy_from_host(a.reshape((-1)).view("|u1"))
+            res = (a, da)
+            cache[key] = res
+
+        return res
+
+    yield get
+    cache.clear()
 
 
 @require_dpctl
@@ -1192,18 +1200,12 @@ _shapes = (1, 7, 16, 25, 64, 65)
         "lambda a: a.sum(axis=1)",
     ],
 )
-@pytest.mark.parametrize("shape", itertools.product(_shapes, _shapes))
+@pytest.mark.parametrize("shape", _shape_pairs)
 @pytest.mark.parametrize("dtype", [np.int32, np.int64, np.float32])
-def test_cfd_reduce2(py_func, shape, dtype):
-    if shape[0] == 1 or shape[1] == 1:
-        # TODO: Handle gpu array access outside the loops
-        pytest.xfail()
-
+def test_cfd_reduce2(py_func, shape, dtype, arange_arrays):
     jit_func = njit(py_func)
 
-    a = np.arange(math.prod(shape), dtype=dtype).reshape(shape).copy()
-
-    da = _from_host(a, buffer="device")
+    a, da = arange_arrays(shape, dtype)
     assert_allclose(jit_func(da), py_func(a), rtol=1e-5)
 
 
@@ -1241,12 +1243,7 @@ def test_cfd_dot(a, b, py_func):
     with print_pass_ir([], ["ConvertParallelLoopToGpu"]):
         jit_func(da, db, dgpu_res)
         ir = get_print_buffer()
-        assert (
-            ir.count(
-                f'numba_util.env_region #gpu_runtime.region_desc<device = "{filter_string}">'
-            )
-            > 0
-        ), ir
+        assert ir.count(_gpu_region_desc()) > 0, ir
         assert ir.count("gpu.launch blocks") == 1, ir
 
     _to_host(dgpu_res, gpu_res)
@@ -11,6 +11,7 @@ from numpy.testing import assert_equal, assert_allclose  # for nans comparison
 import numpy as np
 import itertools
 import math
+import re
 from functools import partial
 import pytest
 from sklearn.datasets import make_regression
@@ -170,6 +171,24 @@ def test_binary(py_func, a, b):
     assert_allclose(py_func(a, b), jit_func(a, b), rtol=1e-7, atol=1e-7)
 
 
+@parametrize_function_variants(
+    "py_func",
+    [
+        "lambda a: a ** 1",
+        "lambda a: a ** 2",
+        "lambda a: a ** 3",
+        "lambda a: np.power(a, 4)",
+        "lambda a: a ** 5",
+    ],
+)
+@pytest.mark.parametrize(
+    "a", _test_binary_test_arrays[2:], ids=_test_binary_test_arrays_ids[2:]
+)
+def test_pow_literal(py_func, a):
+    jit_func = njit(py_func)
+    assert_allclose(py_func(a), jit_func(a), rtol=1e-6)
+
+
 _test_logical_arrays = [
     True,
     False,
@@ -403,6 +422,176 @@ def test_flip2(py_func, arr):
     assert_equal(py_func(arr), jit_func(arr))
 
 
+@pytest.fixture
+def split_reductions(monkeypatch):
+    import numba_mlir.mlir.numpy.funcs
+
+    monkeypatch.setattr(numba_mlir.mlir.numpy.funcs, "SPLIT_REDUCTIONS", 1)
+
+
+@pytest.fixture
+def no_split_reductions(monkeypatch):
+    import numba_mlir.mlir.numpy.funcs
+
+    monkeypatch.setattr(numba_mlir.mlir.numpy.funcs, "SPLIT_REDUCTIONS", 0)
+
+
+@parametrize_function_variants(
+    "py_func",
+    [
+        "lambda a: a.sum()",
+        "lambda a: a.min()",
+        "lambda a: a.max()",
+    ],
+)
+@pytest.mark.parametrize(
+    "shape", [(1,), (7,), (8,), (17,), (1000,), (1, 1), (3, 5), (9, 17), (2, 3, 4)]
+)
+@pytest.mark.parametrize("dtype", [np.int32, np.int64, np.float32, np.float64])
+def test_reduce_split(py_func, shape, dtype, split_reductions):
+    jit_func = njit(py_func)
+    arr = np.arange(math.prod(shape), dtype=dtype).reshape(shape)
+    assert_allclose(py_func(arr), jit_func(arr), rtol=1e-5)
+
+
+def _nested_loop_bounds(ir):
+    # Upper bounds of scf.for loops nested into another scf.for, recovered from
+    # the printed IR indentation.
+    bounds = []
+    stack = []
+    for line in ir.splitlines():
+        match = re.search(r"scf\.for .* to (\S+) step", line)
+        if match is None:
+            continue
+
+        indent = len(line) - len(line.lstrip())
+        while stack and stack[-1] >= indent:
+            stack.pop()
+
+        if stack:
+            bounds.append(match.group(1))
+
+        stack.append(indent)
+
+    return bounds
+
+
+def _check_lane_loop_innermost(ir, lanes):
+    assert ir.count("scf.parallel") == 0, ir
+    bounds = _nested_loop_bounds(ir)
+    assert len(bounds) > 0, ir
+    for bound in bounds:
+        assert re.fullmatch(f"%c{lanes}(_\\d+)?", bound), ir
+
+
+@pytest.mark.parametrize(
+    "dtype,lanes", [(np.int32, 8), (np.float32, 8), (np.float64, 4)]
+)
+@pytest.mark.parametrize("parallel", [False, True])
+def test_reduce_split_lowering(dtype, lanes, parallel, split_reductions):
+    def py_func(a):
+        return a.sum()
+
+    with print_pass_ir([], ["PostLinalgOptPass"]):
+        jit_func = njit(py_func, parallel=parallel)
+        arr = np.arange(1000, dtype=dtype)
+        assert_allclose(py_func(arr), jit_func(arr), rtol=1e-5)
+        ir = get_print_buffer()
+        _check_lane_loop_innermost(ir, lanes)
+
+
+@parametrize_function_variants(
+    "py_func",
+    [
+        "lambda a: a.sum()",
+        "lambda a: np.sum(a, axis=0)",
+        "lambda a: np.sum(a, axis=1)",
+    ],
+)
+@pytest.mark.parametrize("shape", [(0, 3), (3, 0)])
+def test_sum_empty(py_func, shape):
+    jit_func = njit(py_func)
+    arr = np.zeros(shape, np.float64)
+    assert_equal(py_func(arr), jit_func(arr))
+
+
+@parametrize_function_variants(
+    "py_func",
+    [
+        "lambda: np.zeros((0, 3)).sum()",
+        "lambda: np.zeros((3, 0)).sum()",
+        "lambda: np.sum(np.zeros((0, 3)), axis=0)",
+        "lambda: np.sum(np.zeros((0, 3)), axis=1)",
+        "lambda: np.sum(np.zeros((3, 0)), axis=0)",
+        "lambda: np.sum(np.zeros((3, 0)), axis=1)",
+        "lambda: np.dot(np.zeros(0), np.zeros(0))",
+        "lambda: np.dot(np.zeros((2, 0)), np.zeros((0, 3)))",
+    ],
+)
+def test_reduce_static_empty(py_func):
+    jit_func = njit(py_func)
+    assert_equal(py_func(), jit_func())
+
+
+@pytest.mark.parametrize(
+    "m,n,k,split",
+    [
+        (2, 3, 4096, 16),
+        (4, 4, 1000, 2),
+        (1, 1, 512, 2),
+        (1, 1, 511, 1),
+        (64, 64, 4096, 1),
+    ],
+)
+def test_get_split_k(m, n, k, split):
+    from numba_mlir.mlir.numpy.funcs import _get_split_k
+
+    assert _get_split_k(m, n, k) == split
+
+
+@pytest.mark.parametrize("m,n,k", [(2, 3, 4096), (4, 4, 1000), (1, 1, 512)])
+def test_dot_split_k(m, n, k, split_reductions):
+    def py_func():
+        a = np.ones((m, k), np.int64)
+        b = np.ones((k, n), np.int64)
+        return np.dot(a, b)
+
+    with print_pass_ir([], ["PostPlierToLinalgPass"]):
+        jit_func = njit(py_func)
+        assert_equal(py_func(), jit_func())
+        ir = get_print_buffer()
+        assert ir.count("linalg.matmul") == 0, ir
+
+
+def test_dot_split_k_dynamic(split_reductions):
+    # Shapes of array arguments are only known at runtime, so K is not split.
+    def py_func(a, b):
+        return np.dot(a, b)
+
+    a = np.ones((2, 4096), np.int64)
+    b = np.ones((4096, 3), np.int64)
+    with print_pass_ir([], ["PostPlierToLinalgPass"]):
+        jit_func = njit(py_func)
+        assert_equal(py_func(a, b), jit_func(a, b))
+        ir = get_print_buffer()
+        assert ir.count("linalg.matmul") == 1, ir
+
+
+@pytest.mark.parametrize(
+    "a,b",
+    [
+        (np.zeros(0, np.float64), np.zeros(0, np.float64)),
+        (np.zeros((2, 0), np.float64), np.zeros((0, 3), np.float64)),
+    ],
+)
+def test_dot_empty(a, b):
+    def py_func(a, b):
+        return np.dot(a, b)
+
+    jit_func = njit(py_func)
+    assert_equal(py_func(a, b), jit_func(a, b))
+
+
 def test_sum_add():
     def py_func(a, b):
         return np.add(a, b).sum()
@@ -444,6 +633,58 @@ def test_dot(a, b, parallel):
     assert_equal(py_func(a, b), jit_func(a, b))
 
 
+@pytest.mark.parametrize(
+    "dtype1,dtype2",
+    [
+        (np.bool_, np.bool_),
+        (np.uint8, np.uint8),
+        (np.uint32, np.uint32),
+        (np.uint64, np.uint64),
+        (np.int32, np.float32),
+        (np.int64, np.float64),
+        (np.float32, np.int32),
+        (np.int8, np.uint8),
+    ],
+)
+def test_dot_2d_dtypes(dtype1, dtype2):
+    def py_func(a, b):
+        return np.dot(a, b)
+
+    jit_func = njit(py_func)
+    a = (np.arange(12).reshape(3, 4) * 50 % 256).astype(dtype1)
+    b = (np.arange(8).reshape(4, 2) * 70 % 256).astype(dtype2)
+    assert_equal(py_func(a, b), jit_func(a, b))
+
+
+@pytest.mark.parametrize("size", [1, 7, 8, 17, 1000])
+@pytest.mark.parametrize("dtype", [np.int32, np.int64, np.float32, np.float64])
+def test_dot_split(size, dtype, split_reductions):
+    def py_func(a, b):
+        return np.dot(a, b)
+
+    jit_func = njit(py_func)
+    a = np.arange(size, dtype=dtype)
+    b = np.arange(size, dtype=dtype) % 5
+    assert_allclose(py_func(a, b), jit_func(a, b), rtol=1e-5)
+
+
+@pytest.mark.parametrize(
+    "dtype,lanes", [(np.int32, 8), (np.float32, 8), (np.float64, 4)]
+)
+@pytest.mark.parametrize("parallel", [False, True])
+def test_dot_split_lowering(dtype, lanes, parallel, split_reductions):
+    def py_func(a, b):
+        return np.dot(a, b)
+
+    with print_pass_ir([], ["PostLinalgOptPass"]):
+        jit_func = njit(py_func, parallel=parallel)
+        a = np.arange(1000, dtype=dtype)
+        b = np.arange(1000, dtype=dtype) % 5
+        assert_allclose(py_func(a, b), jit_func(a, b), rtol=1e-5)
+        ir = get_print_buffer()
+        _check_lane_loop_innermost(ir, lanes)
+
+
 @pytest.mark.parametrize(
     "a,b",
     [
@@ -674,7 +915,7 @@ def test_broadcast_fusion2(a_shape, b_shape, c_shape):
 
 
 @pytest.mark.parametrize("dtype", [np.int32, np.int64, np.float32])
-def test_np_reduce(dtype):
+def test_np_reduce(dtype, no_split_reductions):
     def py_func(arr):
         return arr.sum()
 
@@ -896,6 +1137,38 @@ def test_array_shape(arr):
     assert_equal(py_func(arr), jit_func(arr))
 
 
+@parametrize_function_variants(
+    "py_func",
+    [
+        "lambda: np.ones((3, 4)).shape",
+        "lambda: len(np.ones((3, 4)))",
+        "lambda: np.ones((3, 4)).size",
+        "lambda: np.ones((3, 4)).T",
+        "lambda: np.ones((3, 4)).reshape(12)",
+        "lambda: np.ones((3, 4)).sum(axis=0)",
+        "lambda: np.dot(np.ones((3, 4)), np.ones((4, 2)))",
+    ],
+)
+def test_static_shape(py_func):
+    jit_func = njit(py_func)
+    assert_equal(py_func(), jit_func())
+
+
+@parametrize_function_variants(
+    "py_func",
+    [
+        "lambda a: np.ones((a.shape[0], 4)).shape",
+        "lambda a: np.ones((a.shape[0], 4)).sum(axis=0)",
+        "lambda a: np.ones((a.shape[0], 4)).sum(axis=1)",
+        "lambda a: np.dot(np.ones((a.shape[0], 4)), np.ones((4, 2)))",
+    ],
+)
+def test_mixed_static_shape(py_func):
+    jit_func = njit(py_func)
+    arr = np.arange(5)
+    assert_equal(py_func(arr), jit_func(arr))
+
+
 @pytest.mark.parametrize("dtype", _arr_dtypes)
 def test_array_itemsize(dtype):
     def py_func(a):
@@ -1264,6 +1537,21 @@ def test_reshape(py_func, array):
     assert_equal(py_func(array), jit_func(array))
 
 
+@parametrize_function_variants(
+    "py_func",
+    [
+        "lambda a: a.reshape((a.shape[0], 1, a.shape[1]))",
+        "lambda a: a.reshape((1, a.shape[0], a.shape[1], 1))",
+        "lambda a: a.reshape((a.shape[0] * a.shape[1], 1))",
+        "lambda a: a.reshape((4, 1, 3))",
+    ],
+)
+def test_reshape_unit_dims(py_func):
+    array = _test_reshape_test_array.reshape((3, 4))
+    jit_func = njit(py_func)
+    assert_equal(py_func(array), jit_func(array))
+
+
 @pytest.mark.xfail(reason="numba: reshape() supports contiguous array only")
 def test_reshape_non_contiguous():
     def py_func(a):
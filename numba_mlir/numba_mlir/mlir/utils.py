@@ -12,30 +12,48 @@ import llvmlite.binding as ll
 from .. import mlir_compiler
 
 
+if sys.platform.startswith("linux"):
+    _lib_name_fmt = "lib{}.so"
+elif sys.platform.startswith("darwin"):
+    _lib_name_fmt = "lib{}.dylib"
+elif sys.platform.startswith("win"):
+    _lib_name_fmt = "{}.dll"
+else:
+    assert False, "unsupported platform"
+
+_runtime_search_paths = [os.path.dirname(numba_mlir.__file__)]
+if "PYTHONPATH" in os.environ:
+    _runtime_search_paths += os.environ["PYTHONPATH"].split(os.pathsep)
+
+_loaded_libs = {}
+
+
 def load_lib(name):
-    runtime_search_paths = [os.path.dirname(numba_mlir.__file__)]
+    lib = _loaded_libs.get(name)
+    if lib is not None:
+        return lib
 
-    try:
-        runtime_search_paths += os.environ["PYTHONPATH"].split(os.pathsep)
-    except KeyError:
-        pass
-
-    if sys.platform.startswith("linux"):
-        lib_name = f"lib{name}.so"
-    elif sys.platform.startswith("darwin"):
-        lib_name = f"lib{name}.dylib"
-    elif sys.platform.startswith("win"):
-        lib_name = f"{name}.dll"
-    else:
-        assert False, "unsupported platform"
+    lib_name = _lib_name_fmt.format(name)
 
     saved_errors = []
-    for path in runtime_search_paths:
-        lib_path = lib_name if len(path) == 0 else os.path.join(path, lib_name)
+    for path in _runtime_search_paths:
+        if len(path) == 0:
+            lib_path = lib_name
+        else:
+            # Avoid costly dlopen failures for missing files.
+            lib_path = os.path.join(path, lib_name)
+            if not os.path.isfile(lib_path):
+                saved_errors.append(f'"{lib_path}": file not found')
+                continue
+
         try:
-            return ctypes.CDLL(lib_path)
+            lib = ctypes.CDLL(lib_path)
         except Exception as e:
             saved_errors.append(f'CDLL("{lib_path}"): {str(e)}')
+            continue
+
+        _loaded_libs[name] = lib
+        return lib
 
     raise ValueError(f'load_lib("{name}") failed:\n' + "\n".join(saved_errors))
 
@@ -60,10 +78,10 @@ def _get_compiler_context():
 
 def register_cfunc(name, cfunc):
     global _registered_cfuncs
-    ptr = ctypes.cast(cfunc, ctypes.c_void_p)
-    _registered_cfuncs.append(ptr)
-    ll.add_symbol(name, ptr.value)
-    mlir_compiler.register_symbol(_get_compiler_context(), name, ptr.value)
+    addr = ctypes.cast(cfunc, ctypes.c_void_p).value
+    _registered_cfuncs.append(cfunc)
+    ll.add_symbol(name, addr)
+    mlir_compiler.register_symbol(_get_compiler_context(), name, addr)
 
 
 def readenv(name, ctor, default):
@@ -845,6 +845,31 @@ static py::object indexImpl(py::capsule context, py::int_ dimObj) {
   return ctx.context.wrapResult(context, res);
 }
 
+static py::object matmulImpl(py::capsule context, py::handle lhs,
+                             py::handle rhs, py::handle out) {
+  auto &ctx = getPyContext(context);
+  auto loc = ctx.loc;
+  auto &builder = ctx.builder;
+
+  auto unpack = [&](py::handle obj) -> mlir::Value {
+    return toTensor(loc, builder, ctx.context.unwrapVal(loc, builder, obj));
+  };
+
+  // Named linalg op bodies use arith ops, which only accept signless types.
+  mlir::Value inputs[] = {
+      doSignCast(builder, loc, unpack(lhs)),
+      doSignCast(builder, loc, unpack(rhs)),
+  };
+  auto init = unpack(out);
+  auto resType = init.getType();
+  init = doSignCast(builder, loc, init);
+
+  auto matmul =
+      builder.create<mlir::linalg::MatmulOp>(loc, init.getType(), inputs, init);
+  auto res = doSignCast(builder, loc, matmul->getResult(0), resType);
+  return ctx.context.createVar(context, res);
+}
+
 static py::object fromElementsImpl(py::capsule context, py::handle values,
                                    py::handle dtype) {
   auto &ctx = getPyContext(context);
@@ -987,6 +1012,21 @@ static py::object reshapeImpl(py::capsule context, py::handle src,
 
   auto resultType = srcType.clone(shape);
 
+  // Collapsing all dims into one is always valid.
+  if (srcRank > 1 && dstRank == 1) {
+    auto dynShapeType = srcType.clone(getDynShape(srcRank));
+    if (dynShapeType != srcType)
+      srcVal = builder.create<mlir::tensor::CastOp>(loc, dynShapeType, srcVal);
+
+    llvm::SmallVector<mlir::ReassociationIndices> reassoc(1);
+    for (auto i : llvm::seq(0u, srcRank))
+      reassoc.front().emplace_back(i);
+
+    mlir::Value res = builder.create<mlir::tensor::CollapseShapeOp>(
+        loc, resultType, srcVal, reassoc);
+    return ctx.context.createVar(context, res);
+  }
+
   // TODO: Limit to 1D case for now
   if ((srcRank == 1) && (dstRank == (srcRank + unitDimsCount)) &&
       (unitDimsCount != 0)) {
@@ -1442,6 +1482,18 @@ static py::object arrayTypeImpl(py::capsule context, py::iterable dims,
   return ctx.context.createType(arrayType);
 }
 
+static py::object inEnvRegionImpl(py::capsule context) {
+  auto &ctx = getPyContext(context);
+  auto block = ctx.builder.getInsertionBlock();
+  auto parent = block ? block->getParentOp() : nullptr;
+  bool res = false;
+  if (parent)
+    res = mlir::isa<numba::util::EnvironmentRegionOp>(parent) ||
+          parent->getParentOfType<numba::util::EnvironmentRegionOp>();
+
+  return py::bool_(res);
+}
+
 static void
 setupPyBuilder(py::handle builder, mlir::OpBuilder &b,
                llvm::function_ref<py::object(mlir::Type)> createType) {
@@ -1450,6 +1502,7 @@ setupPyBuilder(py::handle builder, mlir::OpBuilder &b,
   py::setattr(builder, "_fill_tensor", py::cpp_function(&fillTensorImpl));
   py::setattr(builder, "_linalg_generic", py::cpp_function(&genericImpl));
   py::setattr(builder, "_linalg_index", py::cpp_function(&indexImpl));
+  py::setattr(builder, "_linalg_matmul", py::cpp_function(&matmulImpl));
   py::setattr(builder, "_from_elements", py::cpp_function(&fromElementsImpl));
   py::setattr(builder, "_extract", py::cpp_function(&extractImpl));
   py::setattr(builder, "_reshape", py::cpp_function(&reshapeImpl));
@@ -1463,6 +1516,7 @@ setupPyBuilder(py::handle builder, mlir::OpBuilder &b,
   py::setattr(builder, "_select", py::cpp_function(&selectImpl));
 
   py::setattr(builder, "_array_type", py::cpp_function(&arrayTypeImpl));
+  py::setattr(builder, "_in_env_region", py::cpp_function(&inEnvRegionImpl));
 
   auto addType = [&](const char *name, mlir::Type type) {
     py::setattr(builder, name, createType(type));
@@ -1510,7 +1564,11 @@ static py::object shapeImpl(py::capsule context, py::capsule ssaVal) {
     llvm::SmallVector<mlir::Value> shapeVals(rank);
     for (auto i : llvm::seq(0u, rank)) {
       mlir::Value mlirDim;
-      if (isTensor) {
+      if (!mlirType.isDynamicDim(i)) {
+        // Expose static dims as constants so they can be used as literals.
+        mlirDim = builder.create<mlir::arith::ConstantIndexOp>(
+            loc, mlirType.getDimSize(i));
+      } else if (isTensor) {
         mlirDim = builder.create<mlir::tensor::DimOp>(loc, value, i);
       } else if (isNTensor) {
         mlirDim = builder.create<numba::ntensor::DimOp>(loc, value, i);
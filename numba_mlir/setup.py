@@ -77,11 +77,39 @@ if int(os.environ.get("NUMBA_MLIR_SETUP_RUN_CMAKE", 1)):
     except FileExistsError:
         pass
 
+    # Skip configure step if build dir was already configured with the same
+    # args, build system will rerun cmake itself if CMakeLists.txt change.
+    cmake_args_file = os.path.join(cmake_build_dir, "numba_mlir_cmake_args.txt")
+    cmake_args = "\n".join(cmake_cmd)
+    run_configure = int(os.environ.get("NUMBA_MLIR_SETUP_FORCE_CMAKE", 0))
+    if not os.path.exists(os.path.join(cmake_build_dir, "CMakeCache.txt")):
+        run_configure = True
+
+    try:
+        with open(cmake_args_file) as f:
+            if f.read() != cmake_args:
+                run_configure = True
+    except FileNotFoundError:
+        run_configure = True
+
+    if run_configure:
+        subprocess.check_call(
+            cmake_cmd, stderr=subprocess.STDOUT, shell=False, cwd=cmake_build_dir
+        )
+        with open(cmake_args_file, "w") as f:
+            f.write(cmake_args)
+
     subprocess.check_call(
-        cmake_cmd, stderr=subprocess.STDOUT, shell=False, cwd=cmake_build_dir
-    )
-    subprocess.check_call(
-        ["cmake", "--build", ".", "--config", "Release"], cwd=cmake_build_dir
+        [
+            "cmake",
+            "--build",
+            ".",
+            "--config",
+            "Release",
+            "--parallel",
+            str(os.cpu_count() or 1),
+        ],
+        cwd=cmake_build_dir,
     )
     subprocess.check_call(
         ["cmake", "--install", ".", "--config", "Release"], cwd=cmake_build_dir